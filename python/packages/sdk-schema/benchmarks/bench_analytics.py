@@ -0,0 +1,72 @@
+"""Measure span throughput of the trace analytics over recordings
+
+Run with `python -m benchmarks.bench_analytics` from `python/packages/sdk-schema`.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from typing_extensions import Final
+
+from serverless_sdk_schema import TracePayload
+from serverless_sdk_schema.analytics import analyze
+from serverless_sdk_schema.recording import RecordingWriter
+from serverless_sdk_schema.schema.serverless.instrumentation.v1 import Span
+
+
+FILES: Final[int] = 4
+PAYLOADS: Final[int] = 2_500
+SPANS: Final[int] = 100
+NAMES: Final[int] = 10
+
+
+TRACE_ID: Final[bytes] = b"t" * 16
+
+
+def get_payload() -> TracePayload:
+    trace_id = TRACE_ID
+    root = Span(id=b"root", trace_id=trace_id, name="root", end_time_unix_nano=10**9)
+    spans = [
+        Span(
+            id=index.to_bytes(8, "big"),
+            trace_id=trace_id,
+            parent_span_id=b"root",
+            name=f"span.n{index % NAMES}",
+            start_time_unix_nano=index * 1_000,
+            end_time_unix_nano=index * 1_000 + 500 + index,
+            input="x" * 64,
+        )
+        for index in range(SPANS - 1)
+    ]
+
+    return TracePayload(spans=[root, *spans])
+
+
+def main():
+    data = bytes(get_payload())
+    total = FILES * PAYLOADS * SPANS
+
+    with TemporaryDirectory() as directory:
+        paths = [str(Path(directory) / f"{index}.rec") for index in range(FILES)]
+
+        for path in paths:
+            with RecordingWriter(path) as writer:
+                for index in range(PAYLOADS):
+                    # one trace per payload, trace ids have the same length
+                    trace_id = index.to_bytes(len(TRACE_ID), "big")
+                    writer.write_bytes(data.replace(TRACE_ID, trace_id), {trace_id})
+
+        for jobs in (1, FILES):
+            start = perf_counter()
+            analyze(paths, jobs=jobs).summary()
+            elapsed = perf_counter() - start
+            print(
+                f"jobs={jobs}: {total} spans in {elapsed:.2f}s "
+                f"({total / elapsed:,.0f} spans/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measure the import time of the schema with and without the SDK
+
+Run with `python -m benchmarks.bench_import` from `python/packages/sdk-schema`.
+Every sample is a fresh interpreter, so nothing is cached in `sys.modules`.
+"""
+from __future__ import annotations
+
+import sys
+from statistics import median
+from subprocess import check_output
+from typing import Dict
+
+from typing_extensions import Final
+
+
+RUNS: Final[int] = 20
+
+TIMER: Final[
+    str
+] = """
+from time import perf_counter
+start = perf_counter()
+{statement}
+print(perf_counter() - start)
+"""
+
+# `eager` imports every message module, which is what importing the package did
+# before messages were loaded lazily
+STATEMENTS: Final[Dict[str, str]] = {
+    "schema": "import serverless_sdk_schema",
+    "schema + TracePayload": (
+        "import serverless_sdk_schema\nserverless_sdk_schema.TracePayload"
+    ),
+    "schema (eager)": (
+        "from serverless_sdk_schema.schema.serverless.instrumentation import v1\n"
+        "for name in v1.__all__: getattr(v1, name)"
+    ),
+    "sdk + schema": "import serverless_sdk\nimport serverless_sdk_schema",
+    "sdk + schema + TracePayload": (
+        "import serverless_sdk\nimport serverless_sdk_schema\n"
+        "serverless_sdk_schema.TracePayload"
+    ),
+}
+
+
+def measure(statement: str) -> float:
+    script = TIMER.format(statement=statement)
+    samples = [float(check_output([sys.executable, "-c", script])) for _ in range(RUNS)]
+
+    return median(samples)
+
+
+def main():
+    for label, statement in STATEMENTS.items():
+        print(f"{label:<28} {measure(statement) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure write and read throughput of trace recordings
+
+Run with `python -m benchmarks.bench_recording` from `python/packages/sdk-schema`.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from pathlib import Path
+from random import sample
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from typing_extensions import Final
+
+from serverless_sdk_schema import TracePayload
+from serverless_sdk_schema.recording import RecordingReader, RecordingWriter
+from serverless_sdk_schema.schema.serverless.instrumentation.v1 import Span
+
+
+TRACES: Final[int] = 20_000
+SPANS: Final[int] = 10
+PARSED: Final[int] = 1_000
+LOOKUPS: Final[int] = 200
+MB: Final[int] = 1024 * 1024
+
+
+def get_payload(index: int) -> TracePayload:
+    trace_id = index.to_bytes(16, "big")
+    spans = [
+        Span(
+            id=span.to_bytes(8, "big"),
+            trace_id=trace_id,
+            name="bench.span",
+            start_time_unix_nano=index,
+            end_time_unix_nano=index + span,
+            input="x" * 64,
+        )
+        for span in range(SPANS)
+    ]
+
+    return TracePayload(spans=spans)
+
+
+def main():
+    encoded = [(bytes(get_payload(index)), index) for index in range(TRACES)]
+
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.rec"
+
+        start = perf_counter()
+
+        with RecordingWriter(path) as writer:
+            for data, index in encoded:
+                writer.write_bytes(data, {index.to_bytes(16, "big")})
+
+        elapsed = perf_counter() - start
+        size = path.stat().st_size / MB
+        print(f"write: {size:.1f} MB in {elapsed:.3f}s ({size / elapsed:.1f} MB/s)")
+
+        with RecordingReader(path) as reader:
+            start = perf_counter()
+            count = sum(1 for _ in reader.iter_encoded())
+            elapsed = perf_counter() - start
+            print(f"scan:  {count} records ({size / elapsed:.1f} MB/s)")
+
+            start = perf_counter()
+            parsed = 0
+
+            for data in islice(reader.iter_encoded(), PARSED):
+                TracePayload().parse(data)
+                parsed += len(data)
+
+            elapsed = perf_counter() - start
+            print(f"parse: {parsed / MB / elapsed:.1f} MB/s (first {PARSED} payloads)")
+
+            start = perf_counter()
+            entries = sum(1 for _ in reader.scan_entries())
+            elapsed = perf_counter() - start
+            print(f"index: {entries} entries rebuilt ({size / elapsed:.1f} MB/s)")
+
+            ids = [
+                index.to_bytes(16, "big") for index in sample(range(TRACES), LOOKUPS)
+            ]
+            start = perf_counter()
+
+            for trace_id in ids:
+                assert reader.get(trace_id) is not None
+
+            elapsed = perf_counter() - start
+            print(f"get:   {LOOKUPS / elapsed:.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
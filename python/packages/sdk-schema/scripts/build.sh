@@ -9,3 +9,4 @@ export LIB='serverless_sdk_schema/schema'
 mkdir -p "$LIB"
 
 python -m grpc_tools.protoc -I "$PROTO_PATH" --python_betterproto_out="$LIB" "${PROTOS[@]}"
+python scripts/split.py "$PROTO_PATH" "$LIB"
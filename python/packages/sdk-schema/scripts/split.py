@@ -0,0 +1,153 @@
+"""Split the betterproto output into one module per `.proto` file
+
+betterproto emits a single `__init__.py` per protobuf package, so importing any
+message builds every message of the package. This rewrites each generated
+package into one submodule per source file and replaces its `__init__.py` with
+a registry that imports a submodule the first time one of its names is used.
+
+Usage: `python scripts/split.py <proto path> <generated lib>`, see `build.sh`.
+"""
+from __future__ import annotations
+
+import ast
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+from typing_extensions import Final
+
+
+SOURCES: Final[re.Pattern] = re.compile(r"^# sources: (.+)$", re.MULTILINE)
+DECLARATION: Final[re.Pattern] = re.compile(r"^(?:message|enum)\s+(\w+)", re.MULTILINE)
+
+REGISTRY: Final = """\
+# Generated by scripts/split.py from the betterproto output.  DO NOT EDIT!
+# Messages are imported from their submodule the first time they are used.
+
+from importlib import import_module
+from typing import Any, Dict, List
+
+
+MODULES: Dict[str, str] = {modules}
+
+__all__: List[str] = list(MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+
+    value = getattr(import_module(f".{{module}}", __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({{*globals(), *MODULES}})
+"""
+
+
+def get_declarations(proto: Path) -> List[str]:
+    """Top-level message and enum names declared in `proto`"""
+    source = proto.read_text()
+    top_level = []
+    depth = 0
+
+    for line in source.splitlines():
+        if depth == 0:
+            top_level.append(line.strip())
+
+        depth += line.count("{") - line.count("}")
+
+    return DECLARATION.findall("\n".join(top_level))
+
+
+def get_owner(name: str, owners: Dict[str, str]) -> str:
+    # nested declarations are generated as `ParentChild`
+    matches = [declared for declared in owners if name.startswith(declared)]
+
+    return owners[max(matches, key=len)]
+
+
+def get_references(node: ast.ClassDef) -> Set[str]:
+    """Names used in the field annotations of a generated class"""
+    names = set()
+
+    for statement in node.body:
+        if not isinstance(statement, ast.AnnAssign):
+            continue
+
+        for part in ast.walk(statement.annotation):
+            if isinstance(part, ast.Constant) and isinstance(part.value, str):
+                part = ast.parse(part.value, mode="eval")
+
+            names.update(
+                child.id for child in ast.walk(part) if isinstance(child, ast.Name)
+            )
+
+    return names
+
+
+def split(package: Path, proto_path: Path):
+    init = package / "__init__.py"
+    source = init.read_text()
+    sources = SOURCES.search(source)
+
+    if sources is None:
+        return
+
+    owners: Dict[str, str] = {}
+
+    for proto in sources.group(1).split(", "):
+        for name in get_declarations(proto_path / proto):
+            owners[name] = Path(proto).stem
+
+    lines = source.splitlines(keepends=True)
+    tree = ast.parse(source)
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+
+    if not classes:
+        return
+
+    def start(node: ast.ClassDef) -> int:
+        return min([node.lineno, *(item.lineno for item in node.decorator_list)]) - 1
+
+    header = "".join(lines[: start(classes[0])])
+    ends = [start(node) for node in classes[1:]] + [len(lines)]
+
+    modules: Dict[str, str] = {}
+    bodies: Dict[str, List[str]] = {}
+    imports: Dict[str, Set[str]] = {}
+
+    for node, end in zip(classes, ends):
+        module = get_owner(node.name, owners)
+        modules[node.name] = module
+        bodies.setdefault(module, []).append("".join(lines[start(node) : end]))
+        imports.setdefault(module, set()).update(get_references(node))
+
+    for module, body in bodies.items():
+        siblings = sorted(
+            name
+            for name in imports[module]
+            if name in modules and modules[name] != module
+        )
+        local = "".join(f"from .{modules[name]} import {name}\n" for name in siblings)
+        text = header.rstrip() + "\n" + local + "\n\n" + "".join(body)
+        (package / f"{module}.py").write_text(text.rstrip() + "\n")
+
+    init.write_text(REGISTRY.format(modules=repr(modules)))
+
+
+def main(argv: List[str]):
+    proto_path, lib = map(Path, argv)
+
+    for init in sorted(lib.glob("**/__init__.py")):
+        split(init.parent, proto_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
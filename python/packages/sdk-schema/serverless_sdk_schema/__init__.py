@@ -1,7 +1,24 @@
-from .schema.serverless.instrumentation.v1 import RequestResponse, TracePayload
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from .schema.serverless.instrumentation.v1 import RequestResponse, TracePayload
 
 
 __all__ = [
     "RequestResponse",
     "TracePayload",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # messages are loaded on first use, see `scripts/split.py`
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .schema.serverless.instrumentation import v1
+
+    value = getattr(v1, name)
+    globals()[name] = value
+
+    return value
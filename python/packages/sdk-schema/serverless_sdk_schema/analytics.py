@@ -0,0 +1,397 @@
+"""Critical path and per-name latency statistics over trace recordings
+
+Usage: `serverless-trace-stats [--jobs N] [--json] RECORDING ...`
+
+Spans are decoded straight from the protobuf wire format, reading only the
+fields needed to rebuild each trace's span tree, and durations are kept in
+per-name `array`s rather than per-span objects. Payloads are streamed: a
+trace is aggregated as soon as its payload is read, except for traces the
+recording's index lists in several payloads, whose spans are buffered in
+columns until their last payload.
+"""
+from __future__ import annotations
+
+import json
+from argparse import ArgumentParser
+from array import array
+from collections import defaultdict
+from itertools import repeat
+from functools import partial
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from typing_extensions import Final
+
+from .recording import RecordingReader, get_key
+from .wire import (
+    FIXED64,
+    PAYLOAD_SPANS,
+    SPAN_END,
+    SPAN_ID,
+    SPAN_NAME,
+    SPAN_PARENT_ID,
+    SPAN_START,
+    SPAN_TRACE_ID,
+    WIRE_FIXED32,
+    WIRE_FIXED64,
+    WIRE_LENGTH,
+    WIRE_VARINT,
+    decode_varint,
+    iter_fields,
+)
+
+
+__all__: Final[List[str]] = [
+    "SpanStats",
+    "analyze",
+    "iter_spans",
+    "main",
+]
+
+
+NO_PARENT: Final[bytes] = b""
+PERCENTILES: Final[Tuple[float, ...]] = (0.5, 0.9, 0.99)
+NS_PER_MS: Final[float] = 1e6
+
+# (trace id, id, parent span id, name, start, end)
+SpanRow = Tuple[bytes, bytes, bytes, str, int, int]
+
+
+def iter_spans(data: bytes) -> Iterator[SpanRow]:
+    """Decode the fields needed for analysis from an encoded `TracePayload`"""
+    for field, start, end in iter_fields(data, 0, len(data)):
+        if field == PAYLOAD_SPANS:
+            yield _read_span(data, start, end)
+
+
+def _read_span(data: bytes, position: int, end: int) -> SpanRow:
+    """Decode one `Span`, with single byte varints inlined for speed"""
+    trace_id = id = parent_id = NO_PARENT
+    name: str = ""
+    start_time = end_time = 0
+
+    while position < end:
+        key = data[position]
+        position += 1
+
+        if key & 0x80:
+            key, position = decode_varint(data, position - 1)
+
+        field, wire = key >> 3, key & 0x7
+
+        if wire == WIRE_LENGTH:
+            length = data[position]
+            position += 1
+
+            if length & 0x80:
+                length, position = decode_varint(data, position - 1)
+
+            value_end = position + length
+
+            if field == SPAN_ID:
+                id = data[position:value_end]
+
+            elif field == SPAN_TRACE_ID:
+                trace_id = data[position:value_end]
+
+            elif field == SPAN_PARENT_ID:
+                parent_id = data[position:value_end]
+
+            elif field == SPAN_NAME:
+                name = data[position:value_end].decode()
+
+            position = value_end
+
+        elif wire == WIRE_FIXED64:
+            if field == SPAN_START:
+                (start_time,) = FIXED64.unpack_from(data, position)
+
+            elif field == SPAN_END:
+                (end_time,) = FIXED64.unpack_from(data, position)
+
+            position += 8
+
+        elif wire == WIRE_VARINT:
+            _, position = decode_varint(data, position)
+
+        elif wire == WIRE_FIXED32:
+            position += 4
+
+        else:
+            raise ValueError(f"Unsupported protobuf wire type: {wire}")
+
+    return trace_id, id, parent_id, name, start_time, end_time
+
+
+class PendingTrace:
+    """Columns of the spans of a trace split across payloads, seen so far"""
+
+    __slots__ = ("ids", "parent_ids", "names", "starts", "ends")
+
+    def __init__(self):
+        self.ids: List[bytes] = []
+        self.parent_ids: List[bytes] = []
+        self.names: List[str] = []
+        self.starts: array = array("q")
+        self.ends: array = array("q")
+
+    def extend(self, rows: Iterable[SpanRow]):
+        for _, id, parent_id, name, start, end in rows:
+            self.ids.append(id)
+            self.parent_ids.append(parent_id)
+            self.names.append(name)
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def rows(self, trace_id: bytes) -> List[SpanRow]:
+        columns = self.ids, self.parent_ids, self.names, self.starts, self.ends
+
+        return list(zip(repeat(trace_id), *columns))
+
+
+class SpanStats:
+    """Columnar per-name aggregates that can be merged across processes"""
+
+    traces: int
+    durations: Dict[str, array]
+    self_times: Dict[str, int]
+    critical_times: Dict[str, int]
+
+    def __init__(self):
+        self.traces = 0
+        self.durations = defaultdict(partial(array, "q"))
+        self.self_times = defaultdict(int)
+        self.critical_times = defaultdict(int)
+
+    def add_trace(self, rows: Sequence[SpanRow]):
+        ids: Dict[bytes, int] = {row[1]: index for index, row in enumerate(rows)}
+        children: Dict[int, List[int]] = defaultdict(list)
+        roots: List[int] = []
+
+        for index, (_, _, parent_id, *_) in enumerate(rows):
+            parent = ids.get(parent_id)
+
+            if parent is None or parent == index:
+                roots.append(index)
+
+            else:
+                children[parent].append(index)
+
+        for index, (_, _, _, name, start, end) in enumerate(rows):
+            self.durations[name].append(end - start)
+            self.self_times[name] += _self_time(rows, index, children[index])
+
+        for root in roots:
+            self._add_critical_path(rows, root, children)
+
+        self.traces += 1
+
+    def _add_critical_path(
+        self, rows: Sequence[SpanRow], index: int, children: Dict[int, List[int]]
+    ):
+        """Walk the critical path backwards from the end of span `index`
+
+        Starting with the last child to finish, each step takes the latest
+        child ending at or before the previous one's start. Children on the
+        path are followed recursively, and a span is credited only with the
+        gaps its path children leave uncovered.
+        """
+        stack: List[int] = [index]
+
+        while stack:
+            index = stack.pop()
+            _, _, _, name, start, end = rows[index]
+            kids = sorted(children.get(index, ()), key=lambda kid: -rows[kid][5])
+            cursor: int = end
+            credit: int = 0
+
+            for position, kid in enumerate(kids):
+                _, _, _, _, kid_start, kid_end = rows[kid]
+
+                if position and kid_end > cursor:
+                    continue
+
+                credit += max(0, cursor - kid_end)
+                cursor = kid_start
+                stack.append(kid)
+
+            self.critical_times[name] += credit + max(0, cursor - start)
+
+    def add_payload(self, data: bytes):
+        """Add every trace in one payload, treating each as complete"""
+        self.add_payloads([data])
+
+    def add_payloads(
+        self, payloads: Iterable[bytes], split: Optional[Dict[bytes, int]] = None
+    ):
+        """Add every trace across `payloads`
+
+        Traces are taken as complete once read, unless their key is in
+        `split`, with the number of payloads holding them: those are joined
+        and added with their last payload.
+        """
+        remaining: Dict[bytes, int] = dict(split or {})
+        pending: Dict[bytes, Dict[bytes, PendingTrace]] = {}
+
+        for data in payloads:
+            traces: Dict[bytes, List[SpanRow]] = defaultdict(list)
+
+            for row in iter_spans(data):
+                traces[row[0]].append(row)
+
+            for trace_id, rows in traces.items():
+                key = get_key(trace_id) if remaining else None
+
+                if key is None or key not in remaining:
+                    self.add_trace(rows)
+                    continue
+
+                # traces with colliding keys are held until all are complete
+                held = pending.setdefault(key, {})
+                held.setdefault(trace_id, PendingTrace()).extend(rows)
+                remaining[key] -= 1
+
+                if not remaining[key]:
+                    del remaining[key]
+
+                    for held_id, trace in pending.pop(key).items():
+                        self.add_trace(trace.rows(held_id))
+
+        # the rest of these traces was never recorded, e.g. after a crash
+        for held in pending.values():
+            for held_id, trace in held.items():
+                self.add_trace(trace.rows(held_id))
+
+    def merge(self, other: SpanStats):
+        self.traces += other.traces
+
+        for name, durations in other.durations.items():
+            self.durations[name].extend(durations)
+            self.self_times[name] += other.self_times[name]
+
+        for name, time in other.critical_times.items():
+            self.critical_times[name] += time
+
+    def summary(self) -> List[Dict[str, float]]:
+        rows = []
+
+        for name, durations in sorted(self.durations.items()):
+            ordered = sorted(durations)
+            count = len(ordered)
+            row = {
+                "name": name,
+                "count": count,
+                "mean_ms": sum(ordered) / count / NS_PER_MS,
+                "max_ms": ordered[-1] / NS_PER_MS,
+                "self_ms": self.self_times[name] / NS_PER_MS,
+                "critical_ms": self.critical_times.get(name, 0) / NS_PER_MS,
+            }
+
+            for percentile in PERCENTILES:
+                rank = min(count - 1, int(percentile * count))
+                row[f"p{percentile * 100:g}_ms"] = ordered[rank] / NS_PER_MS
+
+            rows.append(row)
+
+        return rows
+
+
+def _self_time(rows: Sequence[SpanRow], index: int, kids: List[int]) -> int:
+    """Span duration not covered by the union of its children's intervals"""
+    _, _, _, _, start, end = rows[index]
+    covered: int = 0
+    cursor: int = start
+
+    for kid_start, kid_end in sorted((rows[kid][4], rows[kid][5]) for kid in kids):
+        kid_start, kid_end = max(kid_start, cursor), min(kid_end, end)
+
+        if kid_end > kid_start:
+            covered += kid_end - kid_start
+            cursor = kid_end
+
+    return end - start - covered
+
+
+def analyze_file(path: str) -> SpanStats:
+    """Aggregate one recording, joining traces split across its payloads
+
+    Traces are only joined within a file: one trace spread over several
+    recordings is counted once per recording.
+    """
+    stats = SpanStats()
+
+    with RecordingReader(path) as reader:
+        stats.add_payloads(reader.iter_encoded(), reader.split_traces())
+
+    return stats
+
+
+def analyze(paths: Iterable[str], jobs: Optional[int] = 1) -> SpanStats:
+    """Aggregate every recording in `paths`, using `jobs` processes"""
+    paths = list(paths)
+    stats = SpanStats()
+
+    if jobs == 1 or len(paths) < 2:
+        results: Iterable[SpanStats] = map(analyze_file, paths)
+
+        for result in results:
+            stats.merge(result)
+
+        return stats
+
+    with Pool(jobs) as pool:
+        for result in pool.imap_unordered(analyze_file, paths):
+            stats.merge(result)
+
+    return stats
+
+
+def _format(rows: List[Dict[str, float]]) -> str:
+    if not rows:
+        return "No spans found."
+
+    columns = list(rows[0])
+    width = max(len(str(row["name"])) for row in rows)
+    lines = [f"{columns[0]:<{width}} " + " ".join(f"{c:>12}" for c in columns[1:])]
+
+    for row in rows:
+        values = " ".join(
+            f"{row[column]:>12.3f}"
+            if isinstance(row[column], float)
+            else f"{row[column]:>12}"
+            for column in columns[1:]
+        )
+        lines.append(f"{row['name']:<{width}} {values}")
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = ArgumentParser(
+        prog="serverless-trace-stats",
+        description="Per-name latency, self time and critical path statistics",
+    )
+    parser.add_argument("recordings", nargs="+", help="trace recording files")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes to analyze files with (0 for one per CPU)",
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    stats = analyze(args.recordings, jobs=args.jobs or None)
+    rows = stats.summary()
+
+    if args.json:
+        print(json.dumps({"traces": stats.traces, "spans": rows}, indent=2))
+
+    else:
+        print(f"{stats.traces} traces")
+        print(_format(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Append-only recordings of `TracePayload`s with a trailing trace index
+
+A recording is laid out as::
+
+    header   MAGIC
+    records  varint(length) TracePayload ...
+    index    (key, offset) ... sorted by key
+    footer   index offset, entry count, FOOTER_MAGIC
+
+`key` is an 8 byte digest of a trace id and `offset` points at the record
+holding a payload with spans from that trace. Readers map the file and
+binary search the index in place, so lookups and iteration use constant
+memory regardless of recording size.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from hashlib import blake2b
+from io import BufferedRandom
+from mmap import ACCESS_READ, mmap
+from os import PathLike, fsync
+from pathlib import Path
+from struct import Struct
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from betterproto import encode_varint
+from typing_extensions import Final, Self
+
+from .schema.serverless.instrumentation.v1 import TracePayload
+from .wire import decode_varint, get_trace_ids as get_encoded_trace_ids
+
+
+__all__: Final[List[str]] = [
+    "RecordingReader",
+    "RecordingWriter",
+    "InvalidRecording",
+]
+
+
+MAGIC: Final[bytes] = b"SLSREC\x00\x01"
+FOOTER_MAGIC: Final[bytes] = b"SLSIDX\x00\x01"
+KEY_SIZE: Final[int] = 8
+
+ENTRY: Final[Struct] = Struct(f"<{KEY_SIZE}sQ")
+FOOTER: Final[Struct] = Struct("<QQ8s")
+
+Entry = Tuple[bytes, int]
+StrPath = Union[str, PathLike]
+
+
+class InvalidRecording(ValueError):
+    pass
+
+
+def get_key(trace_id: bytes) -> bytes:
+    return blake2b(trace_id, digest_size=KEY_SIZE).digest()
+
+
+def get_trace_ids(payload: TracePayload) -> Set[bytes]:
+    return {span.trace_id for span in payload.spans}
+
+
+class RecordingWriter:
+    """Append `TracePayload`s to a recording, writing its index on close
+
+    Opening an existing recording drops its index, keeps appending after
+    the last complete record, and rewrites the index on close. The index of
+    a recording whose writer never closed is rebuilt by scanning it.
+    """
+
+    path: Path
+    entries: List[Entry]
+
+    def __init__(self, path: StrPath, sync: bool = False):
+        self.path = Path(path)
+        self.sync = sync
+        self.entries = []
+        self._file: BufferedRandom = self._open()
+
+    def _open(self) -> BufferedRandom:
+        if not self.path.exists() or not self.path.stat().st_size:
+            file = self.path.open("wb+")
+            file.write(MAGIC)
+            return file
+
+        with RecordingReader(self.path) as reader:
+            end = reader.records_end
+
+            if reader.index_size:
+                self.entries = list(reader.entries())
+
+            else:
+                self.entries = list(reader.scan_entries())
+
+        file = self.path.open("rb+")
+        file.truncate(end)
+        file.seek(end)
+
+        return file
+
+    def write(self, payload: TracePayload) -> int:
+        """Append `payload` and return the offset of its record"""
+        return self.write_bytes(bytes(payload), get_trace_ids(payload))
+
+    def write_bytes(self, data: bytes, trace_ids: Set[bytes]) -> int:
+        """Append an already encoded `TracePayload` from the given traces"""
+        offset: int = self._file.tell()
+
+        self._file.write(encode_varint(len(data)))
+        self._file.write(data)
+        self.entries.extend((get_key(trace_id), offset) for trace_id in trace_ids)
+
+        return offset
+
+    def flush(self):
+        self._file.flush()
+
+        if self.sync:
+            fsync(self._file.fileno())
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        index_offset: int = self._file.tell()
+        self.entries.sort()
+
+        for entry in self.entries:
+            self._file.write(ENTRY.pack(*entry))
+
+        self._file.write(FOOTER.pack(index_offset, len(self.entries), FOOTER_MAGIC))
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordingReader:
+    """Memory-mapped reader that streams or looks up recorded payloads
+
+    Recordings whose writer never closed have no index: iteration still
+    works, and lookups fall back to a linear scan.
+    """
+
+    path: Path
+    records_end: int
+    index_size: int
+
+    def __init__(self, path: StrPath):
+        self.path = Path(path)
+
+        with self.path.open("rb") as file:
+            self._map: mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise InvalidRecording(f"Not a trace recording: {self.path}")
+
+        self._read_footer()
+
+    def _read_footer(self):
+        size: int = len(self._map)
+        self.records_end, self.index_size = size, 0
+
+        if size < len(MAGIC) + FOOTER.size:
+            self.records_end = self._scan_end()
+            return
+
+        index_offset, count, magic = FOOTER.unpack_from(self._map, size - FOOTER.size)
+        expected: int = index_offset + count * ENTRY.size + FOOTER.size
+
+        if magic != FOOTER_MAGIC or expected != size:
+            self.records_end = self._scan_end()
+            return
+
+        self.records_end, self.index_size = index_offset, count
+
+    def _scan_end(self) -> int:
+        end: int = len(MAGIC)
+
+        for _, end, _ in self._records(len(self._map)):
+            pass
+
+        return end
+
+    def _records(self, end: int) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield (offset, end offset, encoded payload) of each complete record"""
+        position: int = len(MAGIC)
+
+        while position < end:
+            offset: int = position
+
+            try:
+                length, start = decode_varint(self._map, position)
+
+            except IndexError:
+                return
+
+            position = start + length
+
+            if position > end:
+                return
+
+            yield offset, position, self._map[start:position]
+
+    def _read(self, offset: int) -> TracePayload:
+        length, start = decode_varint(self._map, offset)
+
+        return TracePayload().parse(self._map[start : start + length])
+
+    def _entry(self, index: int) -> Entry:
+        return ENTRY.unpack_from(self._map, self.records_end + index * ENTRY.size)
+
+    def entries(self) -> Iterator[Entry]:
+        for index in range(self.index_size):
+            yield self._entry(index)
+
+    def scan_entries(self) -> Iterator[Entry]:
+        """Rebuild index entries, reading only the trace ids of every record"""
+        for offset, _, data in self._records(self.records_end):
+            for trace_id in get_encoded_trace_ids(data):
+                yield get_key(trace_id), offset
+
+    def split_traces(self) -> Dict[bytes, int]:
+        """Keys of traces spread over several records, with their record count
+
+        Read off the sorted index, so only split traces are held in memory.
+        Without an index, every record is scanned and all keys are counted.
+        """
+        if not self.index_size:
+            counts = Counter(key for key, _ in self.scan_entries())
+
+            return {key: count for key, count in counts.items() if count > 1}
+
+        split: Dict[bytes, int] = {}
+        previous: Optional[bytes] = None
+        count = 0
+
+        for key, _ in self.entries():
+            if key == previous:
+                count += 1
+                continue
+
+            if count > 1:
+                split[previous] = count  # type: ignore
+
+            previous, count = key, 1
+
+        if count > 1:
+            split[previous] = count  # type: ignore
+
+        return split
+
+    def iter_encoded(self) -> Iterator[bytes]:
+        """Yield each record's encoded `TracePayload` without parsing it"""
+        for _, _, data in self._records(self.records_end):
+            yield data
+
+    def __iter__(self) -> Iterator[TracePayload]:
+        for data in self.iter_encoded():
+            yield TracePayload().parse(data)
+
+    def find(self, trace_id: bytes) -> List[TracePayload]:
+        """Return every recorded payload holding spans from `trace_id`"""
+        if not self.index_size:
+            return [
+                TracePayload().parse(data)
+                for data in self.iter_encoded()
+                if trace_id in get_encoded_trace_ids(data)
+            ]
+
+        key: bytes = get_key(trace_id)
+        low, high = 0, self.index_size
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._entry(middle)[0] < key:
+                low = middle + 1
+
+            else:
+                high = middle
+
+        payloads: List[TracePayload] = []
+
+        for index in range(low, self.index_size):
+            entry_key, offset = self._entry(index)
+
+            if entry_key != key:
+                break
+
+            payload = self._read(offset)
+
+            if trace_id in get_trace_ids(payload):
+                payloads.append(payload)
+
+        return payloads
+
+    def get(self, trace_id: bytes) -> Optional[TracePayload]:
+        payloads = self.find(trace_id)
+
+        return payloads[0] if payloads else None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,165 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from typing_extensions import Final
+
+from .. import TracePayload
+from ..analytics import SpanStats, analyze, analyze_file, iter_spans, main
+from ..recording import RecordingReader, RecordingWriter, get_key
+from ..schema.serverless.instrumentation.v1 import Span
+
+
+TRACE_ID: Final[bytes] = b"trace"
+
+
+def get_payload(trace_id: bytes = TRACE_ID) -> TracePayload:
+    # root  [0, 100)
+    #   a   [10, 40)
+    #   b   [20, 90)
+    #     c [30, 60)
+    spans: List[Span] = [
+        Span(id=b"root", trace_id=trace_id, name="root", end_time_unix_nano=100),
+        Span(
+            id=b"a",
+            trace_id=trace_id,
+            parent_span_id=b"root",
+            name="child",
+            start_time_unix_nano=10,
+            end_time_unix_nano=40,
+            input="ignored",
+        ),
+        Span(
+            id=b"b",
+            trace_id=trace_id,
+            parent_span_id=b"root",
+            name="child",
+            start_time_unix_nano=20,
+            end_time_unix_nano=90,
+        ),
+        Span(
+            id=b"c",
+            trace_id=trace_id,
+            parent_span_id=b"b",
+            name="leaf",
+            start_time_unix_nano=30,
+            end_time_unix_nano=60,
+        ),
+    ]
+
+    return TracePayload(spans=spans)
+
+
+@pytest.fixture
+def recording(tmp_path: Path) -> Path:
+    path = tmp_path / "traces.rec"
+
+    split = get_payload(b"split")
+
+    with RecordingWriter(path) as writer:
+        writer.write(get_payload())
+        writer.write(TracePayload(spans=split.spans[:2]))
+        writer.write(TracePayload(spans=split.spans[2:]))
+
+    return path
+
+
+def test_iter_spans():
+    rows = list(iter_spans(bytes(get_payload())))
+
+    assert rows[0] == (TRACE_ID, b"root", b"", "root", 0, 100)
+    assert rows[3] == (TRACE_ID, b"c", b"b", "leaf", 30, 60)
+
+
+def test_span_stats():
+    stats = SpanStats()
+    stats.add_payload(bytes(get_payload()))
+
+    assert stats.traces == 1
+    assert list(stats.durations["child"]) == [30, 70]
+
+    # root is covered from 10 to 90, `b` from 30 to 60
+    assert stats.self_times["root"] == 20
+    assert stats.self_times["child"] == 30 + 40
+    assert stats.self_times["leaf"] == 30
+
+    # root -> b -> c
+    assert stats.critical_times["root"] == 30
+    assert stats.critical_times["child"] == 40
+    assert stats.critical_times["leaf"] == 30
+
+
+def test_span_stats_sequential_children():
+    spans = [
+        Span(id=b"root", trace_id=TRACE_ID, name="root", end_time_unix_nano=100),
+        Span(
+            id=b"a",
+            trace_id=TRACE_ID,
+            parent_span_id=b"root",
+            name="a",
+            end_time_unix_nano=50,
+        ),
+        Span(
+            id=b"b",
+            trace_id=TRACE_ID,
+            parent_span_id=b"root",
+            name="b",
+            start_time_unix_nano=50,
+            end_time_unix_nano=100,
+        ),
+    ]
+    stats = SpanStats()
+    stats.add_payload(bytes(TracePayload(spans=spans)))
+
+    assert dict(stats.critical_times) == {"root": 0, "a": 50, "b": 50}
+
+
+def test_analyze_merges_files(recording: Path):
+    single = analyze([str(recording)])
+    parallel = analyze([str(recording)] * 3, jobs=2)
+
+    # the split trace is joined across payloads
+    assert single.traces == 2
+    assert single.critical_times == {"root": 60, "child": 80, "leaf": 60}
+
+    assert parallel.traces == 6
+    assert len(parallel.durations["child"]) == 12
+    assert parallel.critical_times["root"] == 3 * single.critical_times["root"]
+
+
+def test_only_split_traces_are_joined(recording: Path):
+    with RecordingReader(recording) as reader:
+        assert reader.split_traces() == {get_key(b"split"): 2}
+
+    # without the index, the same traces are found by scanning
+    data = recording.read_bytes()
+    unclosed = recording.with_name("unclosed.rec")
+
+    with RecordingReader(recording) as reader:
+        unclosed.write_bytes(data[: reader.records_end])
+
+    with RecordingReader(unclosed) as reader:
+        assert reader.split_traces() == {get_key(b"split"): 2}
+
+    stats = analyze_file(str(unclosed))
+    assert stats.traces == 2
+    assert stats.critical_times == {"root": 60, "child": 80, "leaf": 60}
+
+
+def test_incomplete_split_trace_is_added():
+    split = get_payload(b"split")
+    stats = SpanStats()
+    stats.add_payloads(
+        [bytes(TracePayload(spans=split.spans[:2]))], {get_key(b"split"): 2}
+    )
+
+    assert stats.traces == 1
+    assert len(stats.durations["child"]) == 1
+
+
+def test_main(recording: Path, capsys: pytest.CaptureFixture):
+    main([str(recording), "--json"])
+    output = capsys.readouterr().out
+
+    assert '"traces": 2' in output
+    assert '"name": "leaf"' in output
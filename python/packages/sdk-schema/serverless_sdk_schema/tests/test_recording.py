@@ -0,0 +1,119 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from typing_extensions import Final
+
+from .. import TracePayload
+from ..recording import InvalidRecording, RecordingReader, RecordingWriter
+from ..schema.serverless.instrumentation.v1 import Span
+
+
+TRACES: Final[int] = 50
+
+
+def get_payload(index: int) -> TracePayload:
+    trace_id = f"trace-{index}".encode()
+    spans = [
+        Span(id=f"{index}-{span}".encode(), trace_id=trace_id, name="test")
+        for span in range(3)
+    ]
+
+    return TracePayload(spans=spans)
+
+
+def write_payloads(path: Path, indexes: range) -> List[TracePayload]:
+    payloads = [get_payload(index) for index in indexes]
+
+    with RecordingWriter(path) as writer:
+        for payload in payloads:
+            writer.write(payload)
+
+    return payloads
+
+
+def test_round_trip(tmp_path: Path):
+    path = tmp_path / "traces.rec"
+    payloads = write_payloads(path, range(TRACES))
+
+    with RecordingReader(path) as reader:
+        assert list(reader) == payloads
+        assert reader.index_size == TRACES
+
+        for index in (0, TRACES // 2, TRACES - 1):
+            assert reader.get(f"trace-{index}".encode()) == payloads[index]
+
+        assert reader.get(b"missing") is None
+
+
+def test_scanned_entries_match_index(tmp_path: Path):
+    path = tmp_path / "traces.rec"
+    payloads = write_payloads(path, range(TRACES))
+
+    with RecordingWriter(path) as writer:
+        writer.write(TracePayload(spans=payloads[0].spans + payloads[1].spans))
+
+    with RecordingReader(path) as reader:
+        assert sorted(reader.scan_entries()) == list(reader.entries())
+
+
+def test_append_rewrites_index(tmp_path: Path):
+    path = tmp_path / "traces.rec"
+    first = write_payloads(path, range(TRACES))
+    second = write_payloads(path, range(TRACES, TRACES * 2))
+
+    with RecordingReader(path) as reader:
+        assert list(reader) == first + second
+        assert reader.index_size == TRACES * 2
+        assert reader.get(f"trace-{TRACES}".encode()) == second[0]
+
+
+def test_unclosed_recording_is_scanned(tmp_path: Path):
+    path = tmp_path / "traces.rec"
+    payloads = [get_payload(index) for index in range(3)]
+
+    writer = RecordingWriter(path)
+
+    for payload in payloads:
+        writer.write(payload)
+
+    writer.flush()
+
+    # simulate a crash mid-record
+    with path.open("ab") as file:
+        file.write(b"\x7f\x00")
+
+    with RecordingReader(path) as reader:
+        assert reader.index_size == 0
+        assert list(reader) == payloads
+        assert reader.get(b"trace-1") == payloads[1]
+
+
+def test_rejects_other_files(tmp_path: Path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a recording")
+
+    with pytest.raises(InvalidRecording):
+        RecordingReader(path)
+
+
+def test_reopening_unclosed_recording_rebuilds_index(tmp_path: Path):
+    path = tmp_path / "traces.rec"
+    payloads = [get_payload(index) for index in range(4)]
+
+    writer = RecordingWriter(path)
+
+    for payload in payloads[:3]:
+        writer.write(payload)
+
+    writer.flush()
+
+    with RecordingWriter(path) as writer:
+        writer.write(payloads[3])
+
+    with RecordingReader(path) as reader:
+        assert list(reader) == payloads
+        assert reader.index_size == 4
+
+        for index, payload in enumerate(payloads):
+            assert reader.get(f"trace-{index}".encode()) == payload
@@ -1,5 +1,8 @@
+import sys
+from subprocess import check_output
 from typing import Any, Dict
 
+import pytest
 from typing_extensions import Final
 
 
@@ -83,3 +86,23 @@ def test_trace_payload():
 
     payload = TracePayload()
     assert payload.from_dict(TEST_PAYLOAD)
+
+
+def test_messages_are_loaded_lazily():
+    script = (
+        "import sys, serverless_sdk_schema as schema\n"
+        "print(sorted(name for name in sys.modules if 'instrumentation' in name))\n"
+        "schema.RequestResponse\n"
+        "print(sorted(name for name in sys.modules if name.endswith('v1.trace')))\n"
+    )
+    before, after = check_output([sys.executable, "-c", script], text=True).splitlines()
+
+    assert before == "[]"
+    assert after == "[]"
+
+
+def test_unknown_message():
+    import serverless_sdk_schema
+
+    with pytest.raises(AttributeError):
+        serverless_sdk_schema.Span
@@ -0,0 +1,104 @@
+"""Minimal protobuf wire format reader for encoded `TracePayload`s
+
+Reads fields in place without building betterproto messages, for tools that
+only need a few fields out of large recordings.
+"""
+from __future__ import annotations
+
+from mmap import mmap
+from struct import Struct
+from typing import Iterator, List, Set, Tuple, Union
+
+from typing_extensions import Final
+
+
+__all__: Final[List[str]] = [
+    "decode_varint",
+    "get_trace_ids",
+    "iter_fields",
+]
+
+
+# field numbers from `trace.proto`
+PAYLOAD_SPANS: Final[int] = 3
+SPAN_ID: Final[int] = 1
+SPAN_TRACE_ID: Final[int] = 2
+SPAN_PARENT_ID: Final[int] = 3
+SPAN_NAME: Final[int] = 4
+SPAN_START: Final[int] = 5
+SPAN_END: Final[int] = 6
+
+WIRE_VARINT: Final[int] = 0
+WIRE_FIXED64: Final[int] = 1
+WIRE_LENGTH: Final[int] = 2
+WIRE_FIXED32: Final[int] = 5
+
+FIXED64: Final[Struct] = Struct("<Q")
+
+Buffer = Union[bytes, memoryview, mmap]
+
+
+def decode_varint(data: Buffer, position: int) -> Tuple[int, int]:
+    """Decode a varint in place, unlike `betterproto.decode_varint()` which
+    copies the whole buffer before reading it
+    """
+    value: int = 0
+    shift: int = 0
+
+    while True:
+        byte: int = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+
+        if not byte & 0x80:
+            return value, position
+
+        shift += 7
+
+
+def iter_fields(data: Buffer, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """Yield (field number, value or offset, end) for each field in range
+
+    Length-delimited fields yield their start offset, every other wire type
+    yields its decoded integer value.
+    """
+    position: int = start
+
+    while position < end:
+        key, position = decode_varint(data, position)
+        field, wire = key >> 3, key & 0x7
+
+        if wire == WIRE_VARINT:
+            value, position = decode_varint(data, position)
+            yield field, value, position
+
+        elif wire == WIRE_FIXED64:
+            (value,) = FIXED64.unpack_from(data, position)
+            position += 8
+            yield field, value, position
+
+        elif wire == WIRE_LENGTH:
+            length, value = decode_varint(data, position)
+            position = value + length
+            yield field, value, position
+
+        elif wire == WIRE_FIXED32:
+            position += 4
+
+        else:
+            raise ValueError(f"Unsupported protobuf wire type: {wire}")
+
+
+def get_trace_ids(data: bytes) -> Set[bytes]:
+    """Trace ids of the spans in an encoded `TracePayload`"""
+    trace_ids: Set[bytes] = set()
+
+    for field, start, end in iter_fields(data, 0, len(data)):
+        if field != PAYLOAD_SPANS:
+            continue
+
+        for span_field, value, value_end in iter_fields(data, start, end):
+            if span_field == SPAN_TRACE_ID:
+                trace_ids.add(data[value:value_end])
+
+    return trace_ids
@@ -0,0 +1,64 @@
+"""Compare `ServerlessSdk.create_trace_spans()` against a per-span loop
+
+Run with `python -m benchmarks.bench_bulk_spans` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.clock import now
+from serverless_sdk.span.trace import TraceSpan
+
+
+SIZES: Final[Tuple[int, ...]] = (10_000, 100_000)
+NAME: Final[str] = "batch.record"
+TAGS: Final = {"batch.id": "abc123"}
+
+
+def reset() -> TraceSpan:
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    return TraceSpan("root")
+
+
+def per_span(names: List[str], starts: List[int], ends: List[int]):
+    for name, start, end in zip(names, starts, ends):
+        TraceSpan(name, start_time=start, tags=TAGS).close(end)
+
+
+def bulk(names: List[str], starts: List[int], ends: List[int]):
+    serverlessSdk.create_trace_spans(names, starts, ends, tags=TAGS)
+
+
+def measure(func: Callable, size: int) -> float:
+    current = now()
+    names = [NAME] * size
+    starts = [current - 1_000 * index for index in range(size)]
+    ends = [start + 500 for start in starts]
+
+    reset()
+    start = perf_counter()
+    func(names, starts, ends)
+
+    return perf_counter() - start
+
+
+def main():
+    for size in SIZES:
+        loop = measure(per_span, size)
+        batched = measure(bulk, size)
+
+        print(
+            f"{size:>7} spans: per-span {loop:.3f}s, bulk {batched:.3f}s "
+            f"({loop / batched:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare JSON export throughput of the streaming encoder and pydantic
+
+Run with `python -m benchmarks.bench_encoder` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+from io import StringIO
+from time import perf_counter
+from typing import Callable, List
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.encoder import write_span
+from serverless_sdk.span.trace import TraceSpan
+
+
+SPANS: Final[int] = 10_000
+ROUNDS: Final[int] = 5
+MB: Final[int] = 1024 * 1024
+
+
+def build() -> List[TraceSpan]:
+    trace.root_span = None
+    trace.ctx.set(None)
+    serverlessSdk.tags.update({"service": "bench", "region": "us-east-1"})
+
+    root = TraceSpan("root")
+
+    for index in range(SPANS):
+        tags = {"index": index, "http.method": "GET", "http.status_code": 200}
+        TraceSpan("child", input="x" * 64, tags=tags).close()
+
+    root.close()
+
+    return list(root.spans)
+
+
+def measure(label: str, export: Callable[[], int]):
+    best = min(_timed(export) for _ in range(ROUNDS))
+    size = export()
+
+    print(f"{label:<18} {size / MB / best:7.1f} MB/s  {best * 1000:7.1f} ms")
+
+
+def _timed(export: Callable[[], int]) -> float:
+    start = perf_counter()
+    export()
+
+    return perf_counter() - start
+
+
+def main():
+    spans = build()
+
+    def pydantic_spans() -> int:
+        return sum(len(span.to_protobuf_object().json(by_alias=True)) for span in spans)
+
+    def encoder_spans() -> int:
+        buffer = StringIO()
+
+        for span in spans:
+            write_span(buffer, span)
+
+        return buffer.tell()
+
+    def pydantic_payload() -> int:
+        return len(serverlessSdk._create_trace_payload().json(by_alias=True))
+
+    def encoder_payload() -> int:
+        buffer = StringIO()
+        serverlessSdk._write_trace_payload(buffer)
+
+        return buffer.tell()
+
+    print(f"{len(spans)} spans, best of {ROUNDS}")
+    measure("spans (pydantic)", pydantic_spans)
+    measure("spans (encoder)", encoder_spans)
+    measure("payload (pydantic)", pydantic_payload)
+    measure("payload (encoder)", encoder_payload)
+
+
+if __name__ == "__main__":
+    main()
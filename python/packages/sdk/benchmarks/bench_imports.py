@@ -0,0 +1,65 @@
+"""Measure the overhead of the import profiler on cold imports
+
+Run with `python -m benchmarks.bench_imports` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+import sys
+from importlib import import_module, invalidate_caches
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+
+
+MODULES: Final[int] = 1_000
+ROUNDS: Final[int] = 5
+SOURCE: Final[str] = "VALUES = [index * 2 for index in range(100)]\n"
+
+
+def run(label: str, profiled: bool) -> float:
+    timings = []
+
+    for attempt in range(ROUNDS):
+        with TemporaryDirectory() as directory:
+            package = f"bench_{label.replace(' ', '_')}_{attempt}"
+            path = Path(directory) / package
+            path.mkdir()
+            (path / "__init__.py").write_text("")
+
+            for index in range(MODULES):
+                (path / f"module_{index}.py").write_text(SOURCE)
+
+            sys.path.insert(0, directory)
+            invalidate_caches()
+
+            if profiled:
+                serverlessSdk.import_profiler.install()
+
+            start = perf_counter()
+
+            for index in range(MODULES):
+                import_module(f"{package}.module_{index}")
+
+            timings.append(perf_counter() - start)
+            serverlessSdk.import_profiler.reset()
+            sys.path.remove(directory)
+
+    best = min(timings)
+    print(f"{label:<12} {best / MODULES * 1e6:7.1f} us per module")
+
+    return best
+
+
+def main():
+    print(f"{MODULES} modules imported for the first time, best of {ROUNDS} rounds")
+    plain = run("plain", profiled=False)
+    profiled = run("profiled", profiled=True)
+    print(f"overhead     {(profiled - plain) / plain:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
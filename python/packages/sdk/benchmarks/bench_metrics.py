@@ -0,0 +1,71 @@
+"""Compare payload size and flush time with span-to-metrics rules on and off
+
+Run with `python -m benchmarks.bench_metrics` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+from io import StringIO
+from time import perf_counter
+from typing import Tuple
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.trace import TraceSpan
+
+
+TRACES: Final[int] = 20
+LOOKUPS: Final[int] = 1_000
+QUERIES: Final[int] = 20
+
+
+def run_trace():
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    root = TraceSpan("root")
+
+    for index in range(LOOKUPS):
+        TraceSpan("cache.get", tags={"cache.key": f"user:{index}"}).close()
+
+    for _ in range(QUERIES):
+        TraceSpan("db.query", input="SELECT * FROM users").close()
+
+    root.close()
+
+
+def flush() -> Tuple[int, float]:
+    """Return (payload bytes, seconds) to export every trace and its metrics"""
+    size = 0
+    elapsed = 0.0
+
+    for _ in range(TRACES):
+        run_trace()
+        start = perf_counter()
+
+        buffer = StringIO()
+        serverlessSdk._write_trace_payload(buffer)
+        metrics = serverlessSdk._create_metric_payload()
+        metrics_json = metrics.json(by_alias=True) if metrics else ""
+
+        elapsed += perf_counter() - start
+        size += buffer.tell() + len(metrics_json)
+
+    return size, elapsed
+
+
+def main():
+    print(f"{TRACES} traces of {LOOKUPS} cache lookups and {QUERIES} queries")
+
+    size, elapsed = flush()
+    print(f"rules off: {size:>11,} B, flush {elapsed * 1000:7.1f} ms")
+
+    serverlessSdk.span_metrics.add_rule("cache.get")
+    size, elapsed = flush()
+    print(f"rules on:  {size:>11,} B, flush {elapsed * 1000:7.1f} ms")
+    serverlessSdk.span_metrics.remove_rule("cache.get")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare span allocations and `gc` collections with and without the span pool
+
+Run with `python -m benchmarks.bench_pool` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+import gc
+from io import StringIO
+from time import perf_counter
+from typing import List
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.trace import TraceSpan
+
+
+TRACES: Final[int] = 2_000
+SPANS: Final[int] = 50
+
+
+def run(pooled: bool):
+    serverlessSdk._initialize(span_pool=pooled)
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    gc.collect()
+    before: List[int] = [stats["collections"] for stats in gc.get_stats()]
+    start = perf_counter()
+
+    for index in range(TRACES):
+        root = TraceSpan("root")
+
+        for child in range(SPANS):
+            TraceSpan("child", tags={"index": child}).close()
+
+        root.close()
+        serverlessSdk._write_trace_payload(StringIO())
+
+        if not pooled:
+            trace.root_span = None
+            trace.ctx.set(None)
+
+    elapsed = perf_counter() - start
+    after: List[int] = [stats["collections"] for stats in gc.get_stats()]
+    collections = [end - begin for begin, end in zip(before, after)]
+
+    spans = TRACES * (SPANS + 1)
+    allocated = serverlessSdk.span_pool.allocated if pooled else spans
+
+    label = "pooled" if pooled else "unpooled"
+    print(
+        f"{label:<9} {spans / elapsed:9,.0f} spans/s, "
+        f"{allocated / elapsed:9,.0f} span allocations/s, "
+        f"gc collections (gen 0/1/2): {'/'.join(map(str, collections))}"
+    )
+
+
+def main():
+    print(f"{TRACES} traces of {SPANS + 1} spans, exported as JSON")
+    run(pooled=False)
+    run(pooled=True)
+    serverlessSdk._initialize()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure the cost of the stall probes when nothing stalls
+
+Run with `python -m benchmarks.bench_stalls` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+from time import perf_counter
+from typing import List, Optional
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.trace import TraceSpan
+
+
+# no collection in this benchmark comes near it
+THRESHOLD: Final[int] = 60 * 1_000_000_000
+
+CYCLES: Final[int] = 1_000_000
+TASKS: Final[int] = 100
+YIELDS: Final[int] = 2_000
+ROUNDS: Final[int] = 5
+
+
+def allocate() -> float:
+    """Create reference cycles, so generation 0 is collected over and over"""
+    start = perf_counter()
+
+    for _ in range(CYCLES):
+        node: List[Optional[list]] = [None]
+        node[0] = node
+
+    return perf_counter() - start
+
+
+async def switch():
+    for _ in range(YIELDS):
+        await asyncio.sleep(0)
+
+
+async def schedule(monitored: bool) -> float:
+    if monitored:
+        serverlessSdk.stall_probes.monitor_loop()
+
+    start = perf_counter()
+    await asyncio.gather(*(switch() for _ in range(TASKS)))
+    elapsed = perf_counter() - start
+
+    serverlessSdk.stall_probes.stop_loop()
+
+    return elapsed
+
+
+def run(label: str, threshold: Optional[int]):
+    serverlessSdk._initialize(stall_threshold=threshold)
+    trace.root_span = None
+    trace.ctx.set(None)
+    root = TraceSpan("root")
+
+    before = sum(stats["collections"] for stats in gc.get_stats())
+    allocating = min(allocate() for _ in range(ROUNDS))
+    collections = sum(stats["collections"] for stats in gc.get_stats()) - before
+    switching = min(asyncio.run(schedule(threshold is not None)) for _ in range(ROUNDS))
+
+    root.close()
+    assert not root.sub_spans
+
+    print(
+        f"{label:<11} {CYCLES / allocating:12,.0f} cycles/s "
+        f"({collections // ROUNDS} collections), "
+        f"{TASKS * YIELDS / switching:10,.0f} task switches/s"
+    )
+
+
+def main():
+    print(f"best of {ROUNDS} rounds")
+    run("no probes", None)
+    run("probes", THRESHOLD)
+    serverlessSdk._initialize()
+
+
+if __name__ == "__main__":
+    main()
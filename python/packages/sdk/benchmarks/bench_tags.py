@@ -0,0 +1,67 @@
+"""Compare memory and payload size of copied versus layered span tags
+
+Run with `python -m benchmarks.bench_tags` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+from tracemalloc import get_traced_memory, start, stop
+from typing import Dict, Tuple
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.trace import TraceSpan
+
+
+SPANS: Final[int] = 1_000
+COMMON: Final[Dict[str, str]] = {
+    "org_id": "c5f0e9d2-1b3a-4e6f-8a7b-9c0d1e2f3a4b",
+    "service": "my-service",
+    "region": "us-east-1",
+    "function_name": "my-service-dev-handler",
+    "environment": "dev",
+}
+
+
+def reset():
+    serverlessSdk.tags.clear()
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def build(layered: bool) -> Tuple[int, int]:
+    """Return (traced bytes, payload bytes) for a trace of `SPANS` spans"""
+    reset()
+
+    if layered:
+        serverlessSdk.tags.update(COMMON)
+
+    start()
+    root = TraceSpan("root")
+
+    for index in range(SPANS):
+        tags = {"index": index} if layered else {**COMMON, "index": index}
+        TraceSpan("child", tags=tags).close()
+
+    memory, _ = get_traced_memory()
+    stop()
+
+    root.close()
+    payload = serverlessSdk._create_trace_payload().json(by_alias=True)
+    reset()
+
+    return memory, len(payload.encode())
+
+
+def main():
+    copied_memory, copied_size = build(layered=False)
+    layered_memory, layered_size = build(layered=True)
+
+    print(f"{SPANS} spans with {len(COMMON)} common tags each")
+    print(f"memory:  copied {copied_memory:>9,} B, layered {layered_memory:>9,} B")
+    print(f"payload: copied {copied_size:>9,} B, layered {layered_size:>9,} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure enqueue throughput of the write-ahead queue
+
+Run with `python -m benchmarks.bench_wal` from `python/packages/sdk`.
+"""
+from __future__ import annotations
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from typing_extensions import Final
+
+from serverless_sdk import serverlessSdk
+from serverless_sdk.span import trace
+from serverless_sdk.span.trace import TraceSpan
+from serverless_sdk.span.wal import WriteAheadQueue
+
+
+PAYLOADS: Final[int] = 20_000
+SPANS: Final[int] = 10
+BATCH: Final[int] = 100
+MB: Final[int] = 1024 * 1024
+
+# queue settings for each run, `sync_bytes=0` fsyncs every append
+SETTINGS: Final[Dict[str, Dict[str, int]]] = {
+    "batched fsync": {},
+    "fsync per append": {"sync_bytes": 0},
+    "evicting": {"max_bytes": MB, "segment_size": 64 * 1024},
+}
+
+
+def get_payload(index: int) -> bytes:
+    trace.root_span = None
+    trace.ctx.set(None)
+    root = TraceSpan("bench.root", tags={"index": index})
+
+    for _ in range(SPANS - 1):
+        TraceSpan("bench.span").close()
+
+    root.close()
+    buffer = StringIO()
+    serverlessSdk._write_trace_payload(buffer)
+
+    return buffer.getvalue().encode()
+
+
+def run(label: str, payloads: List[bytes], bulk: bool, **settings: int):
+    size = sum(map(len, payloads)) / MB
+
+    with TemporaryDirectory() as directory:
+        queue = WriteAheadQueue(Path(directory), **{"max_bytes": 1024 * MB, **settings})
+        start = perf_counter()
+
+        if bulk:
+            for index in range(0, len(payloads), BATCH):
+                queue.put_many(payloads[index : index + BATCH])
+
+        else:
+            for data in payloads:
+                queue.put(data)
+
+        queue.close()
+        elapsed = perf_counter() - start
+
+    mode = f"put_many({BATCH})" if bulk else "put"
+    print(
+        f"{label:<17} {mode:<14} {len(payloads) / elapsed:9,.0f} payloads/s "
+        f"{size / elapsed:7.1f} MB/s"
+    )
+
+
+def main():
+    payloads = [get_payload(index) for index in range(PAYLOADS)]
+
+    for label, settings in SETTINGS.items():
+        # fsync per append is slow, a tenth of the payloads is enough
+        amount = PAYLOADS // 10 if settings.get("sync_bytes") == 0 else PAYLOADS
+
+        run(label, payloads[:amount], bulk=False, **settings)
+        run(label, payloads[:amount], bulk=True, **settings)
+
+
+if __name__ == "__main__":
+    main()
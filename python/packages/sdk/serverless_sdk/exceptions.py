@@ -45,3 +45,11 @@ class ClosureOnClosedSpan(SdkException):
 
 class UnreachableTrace(SdkException):
     pass
+
+
+class UseAfterRelease(SdkException):
+    pass
+
+
+class InvalidSegment(InvalidValue):
+    pass
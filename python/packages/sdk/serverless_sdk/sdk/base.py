@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from os import environ
-from typing import List, Optional
+from typing import IO, Iterator, List, Optional, Sequence
 
 from typing_extensions import Final
 
 from ..base import Nanoseconds, SLS_ORG_ID, __version__, __name__
-from ..span.trace import TraceSpan
+from ..span import trace
+from ..span.bulk import BulkTags, create_trace_spans
+from ..span.encoder import write_payload
+from ..span.governor import Governor, governor
+from ..span.imports import ImportProfiler, import_profiler
+from ..span.metrics import MetricPayloadBuf, SpanMetrics, span_metrics
+from ..span.payload import TracePayloadBuf, create_trace_payload, get_sls_tags
+from ..span.pool import SpanPool, pool
+from ..span.redact import Redactor, redactor
+from ..span.stalls import StallProbes, stall_probes
+from ..span.trace import TraceSpan, trace_tags
 from ..span.tags import Tags
 
 
@@ -21,11 +31,28 @@ class ServerlessSdk:
 
     trace_spans: Final = ...
     instrumentation: Final = ...
+    tags: Final[Tags] = trace_tags
+    governor: Final[Governor] = governor
+    span_pool: Final[SpanPool] = pool
+    span_metrics: Final[SpanMetrics] = span_metrics
+    redactor: Final[Redactor] = redactor
+    stall_probes: Final[StallProbes] = stall_probes
+    import_profiler: Final[ImportProfiler] = import_profiler
 
     org_id: Optional[str] = None
 
-    def _initialize(self, org_id: Optional[str] = None):
+    def _initialize(
+        self,
+        org_id: Optional[str] = None,
+        cpu_budget: Optional[Nanoseconds] = None,
+        span_pool: bool = False,
+        stall_threshold: Optional[Nanoseconds] = None,
+    ):
         self.org_id = environ.get(SLS_ORG_ID, default=org_id)
+        self.governor.reset(cpu_budget)
+        self.span_pool.clear()
+        self.span_pool.enabled = span_pool
+        self.stall_probes.reset(stall_threshold)
 
     def create_trace_span(
         self,
@@ -36,3 +63,79 @@ class ServerlessSdk:
         tags: Optional[Tags] = None,
     ) -> TraceSpan:
         return TraceSpan(name, input, output, start_time, tags)
+
+    def create_trace_spans(
+        self,
+        names: Sequence[str],
+        start_times: Sequence[Nanoseconds],
+        end_times: Sequence[Nanoseconds],
+        tags: Optional[BulkTags] = None,
+    ) -> List[TraceSpan]:
+        return create_trace_spans(names, start_times, end_times, tags)
+
+    def _create_trace_payload(self) -> Optional[TracePayloadBuf]:
+        """Encode the current trace, or None if the governor sampled it out"""
+        if not self.governor.sampled:
+            self._release_trace()
+            return None
+
+        start = self.governor.start()
+        root: Optional[TraceSpan] = trace.root_span
+        spans = self._export_spans(root) if root is not None else ()
+
+        payload = create_trace_payload(
+            spans, self.tags, self.org_id or "", self.name, self.version
+        )
+        self._release_trace()
+        self.governor.charge(start)
+
+        return payload
+
+    def _write_trace_payload(self, buffer: IO[str]) -> bool:
+        """Write the current trace, unless the governor sampled it out"""
+        if not self.governor.sampled:
+            self._release_trace()
+            return False
+
+        start = self.governor.start()
+        root: Optional[TraceSpan] = trace.root_span
+        spans = self._export_spans(root) if root is not None else ()
+
+        write_payload(
+            buffer, spans, self.tags, self.org_id or "", self.name, self.version
+        )
+        self._release_trace()
+        self.governor.charge(start)
+
+        return True
+
+    def _export_spans(self, root: TraceSpan) -> Iterator[TraceSpan]:
+        self.import_profiler.attach(root)
+
+        return self.span_metrics.export(root)
+
+    def _create_metric_payload(self) -> Optional[MetricPayloadBuf]:
+        """Flush the metrics of folded spans, or None if nothing was folded"""
+        metrics = self.span_metrics.flush()
+
+        if not metrics:
+            return None
+
+        sls_tags, _ = get_sls_tags(
+            self.tags, self.org_id or "", self.name, self.version
+        )
+
+        return MetricPayloadBuf(sls_tags=sls_tags, metrics=metrics)
+
+    def _release_trace(self):
+        """End an exported, closed trace, handing its spans to the span pool"""
+        root: Optional[TraceSpan] = trace.root_span
+
+        if root is None or root.end_time is None:
+            return
+
+        trace.root_span = None
+        trace.ctx.set(None)
+
+        if self.span_pool.enabled:
+            self.span_pool.release(root.spans)
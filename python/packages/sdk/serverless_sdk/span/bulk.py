@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from typing_extensions import Final
+
+from ..base import Nanoseconds
+from ..exceptions import (
+    FutureSpanStartTime,
+    InvalidType,
+    InvalidValue,
+    PastSpanEndTime,
+    UnreachableTrace,
+)
+from . import clock
+from .governor import governor
+from .id import generate_ids
+from .name import get_resource_name
+from .tags import Tags
+from .trace import TraceSpan
+
+
+__all__: Final[List[str]] = [
+    "create_trace_spans",
+]
+
+
+BulkTags = Union[Mapping, Sequence[Optional[Mapping]]]
+
+
+def create_trace_spans(
+    names: Sequence[str],
+    start_times: Sequence[Nanoseconds],
+    end_times: Sequence[Nanoseconds],
+    tags: Optional[BulkTags] = None,
+) -> List[TraceSpan]:
+    """Materialize closed child spans of the current span in one pass
+
+    Names are validated once per distinct value, the clock is read once, and
+    ids for every span come from a single call to the random source. `tags`
+    is either one mapping shared by every span, which each span inherits
+    rather than copies, or one mapping per span.
+    """
+    start = governor.start()
+    amount: int = len(names)
+
+    if len(start_times) != amount or len(end_times) != amount:
+        raise InvalidValue(
+            "Cannot create trace spans: "
+            "`names`, `start_times` and `end_times` must have the same length"
+        )
+
+    valid_names: Dict[str, str] = {name: get_resource_name(name) for name in set(names)}
+    _ensure_times(start_times, end_times)
+    parent: TraceSpan = _get_parent()
+    span_tags: List[Tags] = _get_tags(
+        tags if governor.tags else None, amount, parent.tags
+    )
+
+    trace_id = parent.trace_id
+    ids = generate_ids(amount)
+    restore = TraceSpan._restore
+    attach = governor.spans
+
+    spans = [
+        restore(
+            id, trace_id, parent, valid_names[name], begin, end, tags=tag, attach=attach
+        )
+        for id, name, begin, end, tag in zip(
+            ids, names, start_times, end_times, span_tags
+        )
+    ]
+    governor.charge(start)
+
+    return spans
+
+
+def _ensure_times(start_times: Sequence[Nanoseconds], end_times: Sequence[Nanoseconds]):
+    if not start_times:
+        return
+
+    types = {*map(type, start_times), *map(type, end_times)}
+
+    if types != {int}:
+        raise InvalidType("`start_times` and `end_times` must be integers.")
+
+    if max(start_times) > clock.now():
+        raise FutureSpanStartTime(
+            "Cannot initialize span: Start time cannot be set in the future"
+        )
+
+    if any(end < start for start, end in zip(start_times, end_times)):
+        raise PastSpanEndTime(
+            "Cannot close span: End time cannot be earlier than start time"
+        )
+
+
+def _get_tags(tags: Optional[BulkTags], amount: int, inherited: Tags) -> List[Tags]:
+    if tags is None:
+        return [Tags(inherited=inherited) for _ in range(amount)]
+
+    if isinstance(tags, Mapping):
+        shared = Tags(inherited=inherited)
+        shared.update(tags)
+
+        return [Tags(inherited=shared) for _ in range(amount)]
+
+    if len(tags) != amount:
+        raise InvalidValue(
+            "Cannot create trace spans: `tags` must have one entry per span"
+        )
+
+    span_tags: List[Tags] = []
+
+    for mapping in tags:
+        validated = Tags(inherited=inherited)
+
+        if mapping:
+            validated.update(mapping)
+
+        span_tags.append(validated)
+
+    return span_tags
+
+
+def _get_parent() -> TraceSpan:
+    parent: Optional[TraceSpan] = TraceSpan.resolve_open_span()
+
+    if parent is None:
+        raise UnreachableTrace("Cannot create trace spans: No open trace span")
+
+    return parent
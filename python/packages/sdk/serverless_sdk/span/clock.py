@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from time import perf_counter_ns, time_ns
+from typing import List
+
+from typing_extensions import Final
+
+from ..base import Nanoseconds
+
+
+__all__: Final[List[str]] = [
+    "anchor",
+    "now",
+]
+
+
+# offset from the monotonic clock to the Unix epoch, see `anchor()`
+offset: Nanoseconds = time_ns() - perf_counter_ns()
+
+
+def anchor():
+    """Re-anchor the monotonic clock to the wall clock
+
+    Called once per trace so that wall clock adjustments between
+    invocations are picked up, while every timestamp within a trace comes
+    from the monotonic clock and durations are never skewed.
+    """
+    global offset
+    offset = time_ns() - perf_counter_ns()
+
+
+def now() -> Nanoseconds:
+    """Current epoch time in nanoseconds, derived from the monotonic clock"""
+    return perf_counter_ns() + offset
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from json import JSONEncoder
+from json.encoder import encode_basestring_ascii  # type: ignore
+from operator import attrgetter
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+from typing_extensions import Final
+
+from .payload import TracePayloadBuf, get_sls_tags
+from .redact import redactor
+from .tags import Tags
+from .trace import TraceSpan, TraceSpanBuf
+
+
+__all__: Final[List[str]] = [
+    "encode_value",
+    "get_keys",
+    "write_payload",
+    "write_span",
+]
+
+
+Getter = Callable[[TraceSpan], Any]
+
+# same separators and encoders as `BaseModel.json()`
+_encode: Final[Callable[[Any], str]] = JSONEncoder(default=pydantic_encoder).encode
+_keys: Final[Dict[Type[BaseModel], Dict[str, str]]] = {}
+
+
+def _get_parent_id(span: TraceSpan) -> Optional[str]:
+    return span.parent_span.id if span.parent_span else None
+
+
+def _get_tags(span: TraceSpan) -> Dict[str, Any]:
+    return redactor.scrub_tags(span.tags.flatten(until=span._inherited_tags))
+
+
+def _get_input(span: TraceSpan) -> Optional[str]:
+    return redactor.scrub(span.input)
+
+
+def _get_output(span: TraceSpan) -> Optional[str]:
+    return redactor.scrub(span.output)
+
+
+# how each `TraceSpanBuf` field is read from a span, unset fields are null
+SPAN_GETTERS: Final[Dict[str, Getter]] = {
+    "id": attrgetter("id"),
+    "trace_id": attrgetter("trace_id"),
+    "parent_span_id": _get_parent_id,
+    "name": attrgetter("name"),
+    "start_time_unix_nano": attrgetter("start_time"),
+    "end_time_unix_nano": attrgetter("end_time"),
+    "tags": _get_tags,
+    "input": _get_input,
+    "output": _get_output,
+}
+
+
+def get_keys(model: Type[BaseModel]) -> Dict[str, str]:
+    """Map `model`'s fields to their camelCase key, with the separator before it
+
+    Computed once per class, in the order `BaseModel.json()` writes them.
+    """
+    keys = _keys.get(model)
+
+    if keys is None:
+        keys = _keys[model] = {
+            name: f"{', ' if index else '{'}{encode_basestring_ascii(field.alias)}: "
+            for index, (name, field) in enumerate(model.__fields__.items())
+        }
+
+    return keys
+
+
+def encode_value(value: Any) -> str:
+    """Encode a field value exactly as `BaseModel.json()` does"""
+    kind = type(value)
+
+    if kind is str:
+        return encode_basestring_ascii(value)
+
+    if value is None:
+        return "null"
+
+    if kind is int:
+        return int.__repr__(value)
+
+    if kind is bool:
+        return "true" if value else "false"
+
+    return _encode(value)
+
+
+SPAN_TABLE: Final[List[Tuple[str, Optional[Getter]]]] = [
+    (key, SPAN_GETTERS.get(name)) for name, key in get_keys(TraceSpanBuf).items()
+]
+
+
+def write_span(buffer: IO[str], span: TraceSpan):
+    """Write `span` as the camelCase JSON of `span.to_protobuf_object()`"""
+    write = buffer.write
+
+    for key, getter in SPAN_TABLE:
+        write(key)
+        write("null" if getter is None else encode_value(getter(span)))
+
+    write("}")
+
+
+def _write_model(buffer: IO[str], model: BaseModel):
+    write = buffer.write
+
+    for name, key in get_keys(type(model)).items():
+        value = getattr(model, name)
+        write(key)
+
+        if isinstance(value, BaseModel):
+            _write_model(buffer, value)
+
+        else:
+            write(encode_value(value))
+
+    write("}")
+
+
+def write_payload(
+    buffer: IO[str],
+    spans: Iterable[TraceSpan],
+    trace_tags: Tags,
+    org_id: str,
+    name: str,
+    version: str,
+):
+    """Stream the camelCase JSON of `create_trace_payload()` into `buffer`
+
+    Spans are written one by one, without building their `TraceSpanBuf`.
+    """
+    write = buffer.write
+    sls_tags, custom_tags = get_sls_tags(trace_tags, org_id, name, version)
+    values: Dict[str, Any] = {"events": [], "custom_tags": custom_tags}
+
+    for field, key in get_keys(TracePayloadBuf).items():
+        write(key)
+
+        if field == "sls_tags":
+            _write_model(buffer, sls_tags)
+
+        elif field == "spans":
+            write("[")
+
+            for index, span in enumerate(spans):
+                if index:
+                    write(", ")
+
+                write_span(buffer, span)
+
+            write("]")
+
+        else:
+            write(encode_value(values[field]))
+
+    write("}")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import Context, copy_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from typing_extensions import Final
+
+from ..base import TraceId
+from . import trace
+from .trace import TraceSpan
+
+
+__all__: Final[List[str]] = [
+    "TracedProcessPoolExecutor",
+    "TracedThreadPoolExecutor",
+    "run_in_executor",
+]
+
+
+# (id, parent id, name, start time, end time, input, output, tags)
+PackedSpan = Tuple[
+    TraceId,
+    TraceId,
+    str,
+    int,
+    Optional[int],
+    Optional[str],
+    Optional[str],
+    Dict[str, Any],
+]
+PARENT_NAME: Final[str] = "remote.parent"
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool that runs each task in a copy of the submitter's context"""
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        context = copy_context()
+
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+class TracedProcessPoolExecutor(ProcessPoolExecutor):
+    """Process pool that parents worker spans under the submitter's span
+
+    Spans created in a worker are flattened to tuples of primitives, shipped
+    back alongside the task's result in the same pickled message, and merged
+    into the submitting process' trace when the task completes.
+    """
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        parent = TraceSpan.resolve_current_span()
+
+        if parent is None:
+            return super().submit(fn, *args, **kwargs)
+
+        inner = super().submit(
+            _run_in_process, parent.id, parent.trace_id, fn, args, kwargs
+        )
+
+        return _chain(inner, lambda packed: _merge(parent, packed))
+
+
+def _run_in_process(
+    parent_id: TraceId,
+    trace_id: TraceId,
+    fn: Callable,
+    args: Tuple,
+    kwargs: Dict[str, Any],
+) -> Tuple[Any, List[PackedSpan]]:
+    parent = TraceSpan._restore(parent_id, trace_id, None, PARENT_NAME, 0)
+    previous_root = trace.root_span
+    trace.root_span = parent
+
+    try:
+        result = Context().run(_run_with_parent, parent, fn, args, kwargs)
+
+    finally:
+        trace.root_span = previous_root
+
+    return result, _pack(parent)
+
+
+def _run_with_parent(
+    parent: TraceSpan, fn: Callable, args: Tuple, kwargs: Dict[str, Any]
+) -> Any:
+    trace.ctx.set(parent)
+
+    return fn(*args, **kwargs)
+
+
+def _pack(parent: TraceSpan) -> List[PackedSpan]:
+    return [
+        (
+            span.id,
+            span.parent_span.id,
+            span.name,
+            span.start_time,
+            span.end_time,
+            span.input,
+            span.output,
+            dict(span.tags),
+        )
+        for sub_span in parent.sub_spans
+        for span in sub_span.spans
+    ]
+
+
+def _merge(parent: TraceSpan, packed: Tuple[Any, List[PackedSpan]]) -> Any:
+    result, packed_spans = packed
+    spans: Dict[TraceId, TraceSpan] = {parent.id: parent}
+
+    for id, parent_id, name, start, end, input, output, tags in packed_spans:
+        spans[id] = TraceSpan._restore(
+            id,
+            parent.trace_id,
+            spans[parent_id],
+            name,
+            start,
+            end,
+            input,
+            output,
+            tags,
+        )
+
+    return result
+
+
+class _ChainedFuture(Future):
+    """Future resolved from `inner`, forwarding cancellation to it"""
+
+    def __init__(self, inner: Future):
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self) -> bool:
+        return self._inner.cancel() and super().cancel()
+
+
+def _chain(inner: Future, transform: Callable[[Any], Any]) -> Future:
+    outer = _ChainedFuture(inner)
+
+    def done(future: Future):
+        if outer.done():
+            return
+
+        if future.cancelled():
+            Future.cancel(outer)
+            outer.set_running_or_notify_cancel()
+            return
+
+        error = future.exception()
+
+        if error is not None:
+            outer.set_exception(error)
+            return
+
+        try:
+            result = transform(future.result())
+
+        except BaseException as e:
+            outer.set_exception(e)
+            return
+
+        outer.set_result(result)
+
+    inner.add_done_callback(done)
+
+    return outer
+
+
+def run_in_executor(executor: Optional[Any], fn: Callable, *args) -> asyncio.Future:
+    """`loop.run_in_executor()` that carries the current span into the worker"""
+    loop = asyncio.get_running_loop()
+    context = copy_context()
+
+    return loop.run_in_executor(executor, context.run, fn, *args)
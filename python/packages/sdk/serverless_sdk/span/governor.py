@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from time import thread_time_ns
+from typing import Callable, List, Optional
+
+from typing_extensions import Final
+
+from ..base import Nanoseconds
+from .tags import Tags
+
+
+__all__: Final[List[str]] = [
+    "Fidelity",
+    "Governor",
+    "governor",
+]
+
+
+# consecutive invocations under `RECOVERY_RATIO` of the budget before stepping up
+RECOVERY: Final[int] = 10
+RECOVERY_RATIO: Final[float] = 0.5
+
+# at `Fidelity.SAMPLED`, one trace in `SAMPLE_RATE` is kept
+SAMPLE_RATE: Final[int] = 10
+
+
+class Fidelity(IntEnum):
+    """What is recorded, each level also drops what the previous ones drop"""
+
+    FULL = 0
+    NO_BODIES = 1
+    NO_TAGS = 2
+    NO_CHILD_SPANS = 3
+    SAMPLED = 4
+
+
+class Governor:
+    """Keep the SDK's own CPU time per invocation within `budget` nanoseconds
+
+    Time spent in the SDK is charged to the current invocation, which starts
+    with each new root span. An invocation over budget lowers the fidelity of
+    the next one: input and output bodies are dropped first, then tags, then
+    child spans, then whole traces are sampled. After `recovery` invocations
+    well under budget, fidelity is raised again by one level.
+
+    Disabled while `budget` is None, in which case nothing is timed.
+    """
+
+    budget: Optional[Nanoseconds]
+    level: Fidelity
+    spent: Nanoseconds
+    last_spent: Nanoseconds
+    step: Optional[str]
+
+    # what the current invocation records
+    bodies: bool
+    tags: bool
+    spans: bool
+    sampled: bool
+
+    def __init__(
+        self,
+        budget: Optional[Nanoseconds] = None,
+        recovery: int = RECOVERY,
+        sample_rate: int = SAMPLE_RATE,
+        timer: Callable[[], Nanoseconds] = thread_time_ns,
+    ):
+        self.recovery = recovery
+        self.sample_rate = sample_rate
+        self.timer = timer
+        self.reset(budget)
+
+    def reset(self, budget: Optional[Nanoseconds] = None):
+        self.budget = budget
+        self.level = Fidelity.FULL
+        self.spent = 0
+        self.last_spent = 0
+        self.step = None
+        self._under = 0
+        self._invocations = 0
+        self._apply()
+
+    def start(self) -> Nanoseconds:
+        return 0 if self.budget is None else self.timer()
+
+    def charge(self, start: Nanoseconds):
+        """Charge the time since `start()` to the current invocation"""
+        if self.budget is not None:
+            self.spent += self.timer() - start
+
+    def begin(self):
+        """Settle the previous invocation and set the fidelity of a new one"""
+        if self.budget is None:
+            return
+
+        self.last_spent, self.spent = self.spent, 0
+        self.step = None
+
+        if self._invocations and self.last_spent > self.budget:
+            self._under = 0
+
+            if self.level < Fidelity.SAMPLED:
+                self.level = Fidelity(self.level + 1)
+                self.step = "down"
+
+        elif self.last_spent < self.budget * RECOVERY_RATIO:
+            self._under += 1
+
+            if self._under >= self.recovery and self.level > Fidelity.FULL:
+                self.level = Fidelity(self.level - 1)
+                self.step = "up"
+                self._under = 0
+
+        else:
+            self._under = 0
+
+        self._invocations += 1
+        self._apply()
+
+    def record(self, tags: Tags):
+        """Record the fidelity and the step taken, if any, on the root span"""
+        if self.budget is None:
+            return
+
+        # set directly, so they're kept even when tags are dropped
+        tags["sdk.governor.level"] = self.level.name.lower()
+        tags["sdk.governor.cpu_time"] = self.last_spent
+
+        if self.step is not None:
+            tags["sdk.governor.step"] = self.step
+
+    def _apply(self):
+        level = self.level
+        self.bodies = level < Fidelity.NO_BODIES
+        self.tags = level < Fidelity.NO_TAGS
+        self.spans = level < Fidelity.NO_CHILD_SPANS
+        self.sampled = (
+            level < Fidelity.SAMPLED or self._invocations % self.sample_rate == 0
+        )
+
+        if not self.sampled:
+            self.spans = False
+
+
+governor: Final[Governor] = Governor()
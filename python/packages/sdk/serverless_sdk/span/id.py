@@ -9,6 +9,7 @@ from ..base import TraceId
 
 __all__: Final[List[str]] = [
     "generate_id",
+    "generate_ids",
 ]
 
 
@@ -17,3 +18,11 @@ DEFAULT_BYTES: Final[int] = 16
 
 def generate_id(count: int = DEFAULT_BYTES) -> TraceId:
     return token_hex(count)
+
+
+def generate_ids(amount: int, count: int = DEFAULT_BYTES) -> List[TraceId]:
+    """Generate `amount` ids from a single call to the system's random source"""
+    width: int = count * 2
+    ids: str = token_hex(count * amount)
+
+    return [ids[index : index + width] for index in range(0, len(ids), width)]
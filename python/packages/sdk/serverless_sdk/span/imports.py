@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import sys
+from heapq import heappush, heappushpop
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from threading import local
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from typing_extensions import Final
+
+from ..base import Nanoseconds
+from . import clock
+from .governor import governor
+from .id import generate_id
+from .trace import TraceSpan, begin_trace_callbacks
+
+
+__all__: Final[List[str]] = [
+    "ImportProfiler",
+    "import_profiler",
+]
+
+
+INITIALIZATION_SPAN: Final[str] = "python.initialization"
+IMPORT_SPAN: Final[str] = "python.import"
+
+DEFAULT_TOP: Final[int] = 10
+
+# self time, module name, start and end time of one import
+Import = Tuple[Nanoseconds, str, Nanoseconds, Nanoseconds]
+
+
+class TimedLoader:
+    """Time `create_module()` and `exec_module()` of the wrapped loader
+
+    Extension modules are initialized in `create_module()`, so both count
+    towards the module's self time. Everything else is delegated.
+    """
+
+    start: Optional[Nanoseconds]
+    self_time: Nanoseconds
+
+    def __init__(self, loader: Any, profiler: ImportProfiler):
+        self.loader = loader
+        self.profiler = profiler
+        self.start = None
+        self.self_time = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        self.start = clock.now()
+
+        return self.profiler._time(self, self.loader.create_module, spec)
+
+    def exec_module(self, module: ModuleType):
+        # hand the module its real loader before any of its code runs
+        module.__loader__ = self.loader
+
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+
+        # `create_module()` isn't called when a module is reloaded
+        start = self.start if self.start is not None else clock.now()
+
+        try:
+            self.profiler._time(self, self.loader.exec_module, module)
+
+        finally:
+            self.profiler._add((self.self_time, module.__name__, start, clock.now()))
+
+
+class ImportProfiler(MetaPathFinder):
+    """Time the modules imported during initialization
+
+    Installed first on `sys.meta_path`, it wraps the loader of each module
+    imported for the first time and times its execution, less the time spent
+    importing other modules from it. Only the `top` slowest imports are kept,
+    so memory doesn't grow with the number of modules, and modules that are
+    already imported cost nothing.
+
+    Initialization ends when the first trace begins: the profiler uninstalls
+    itself, and imports still running then are dropped. `attach()` records it
+    once, under the root span of the first exported trace, as a
+    `python.initialization` span with the top imports as `python.import`
+    child spans. When the governor drops child spans, they're recorded as
+    tags instead.
+    """
+
+    top: int
+    start_time: Optional[Nanoseconds]
+    end_time: Optional[Nanoseconds]
+    imports: List[Import]
+    modules: int
+    import_time: Nanoseconds
+
+    def __init__(self, top: int = DEFAULT_TOP):
+        self.top = top
+        self._nested = local()
+        self._on_begin_trace: Callable[[], None] = self.finish
+        self.reset()
+
+    def reset(self):
+        self.uninstall()
+        self.start_time = self.end_time = None
+        self.imports = []
+        self.modules = 0
+        self.import_time = 0
+
+    @property
+    def installed(self) -> bool:
+        return self in sys.meta_path
+
+    def install(self, top: Optional[int] = None):
+        """Profile imports from now on, call before user code is loaded"""
+        self.reset()
+
+        if top is not None:
+            self.top = top
+
+        self.start_time = clock.now()
+        sys.meta_path.insert(0, self)
+        begin_trace_callbacks.append(self._on_begin_trace)
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+
+        if self._on_begin_trace in begin_trace_callbacks:
+            begin_trace_callbacks.remove(self._on_begin_trace)
+
+    def finish(self):
+        """End initialization now, called when the first trace begins"""
+        self.uninstall()
+
+        if self.start_time is not None and self.end_time is None:
+            self.end_time = clock.now()
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+
+            if finder is self or find_spec is None:
+                continue
+
+            spec: Optional[ModuleSpec] = find_spec(fullname, path, target)
+
+            if spec is not None:
+                break
+
+        else:
+            return None
+
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = TimedLoader(spec.loader, self)
+
+        return spec
+
+    def _time(self, loader: TimedLoader, call: Callable[[Any], Any], arg: Any) -> Any:
+        """Charge `loader` the time of `call(arg)`, less the imports it nests"""
+        nested: List[Nanoseconds] = self._nested.__dict__.setdefault("stack", [])
+        nested.append(0)
+        start = clock.now()
+
+        try:
+            return call(arg)
+
+        finally:
+            elapsed = clock.now() - start
+            loader.self_time += elapsed - nested.pop()
+
+            if nested:
+                nested[-1] += elapsed
+
+    def _add(self, timed: Import):
+        # imports that end after initialization belong to a trace
+        if self.start_time is None or self.end_time is not None:
+            return
+
+        self.modules += 1
+        self.import_time += timed[0]
+
+        if len(self.imports) < self.top:
+            heappush(self.imports, timed)
+
+        elif self.top:
+            heappushpop(self.imports, timed)
+
+    def attach(self, root: TraceSpan):
+        """Record initialization under `root`, once"""
+        start = self.start_time
+
+        if start is None:
+            return
+
+        self.finish()
+        end: Nanoseconds = self.end_time  # type: ignore
+        self.start_time = self.end_time = None
+        imports = sorted(self.imports, reverse=True)
+        tags: Dict[str, Any] = {
+            "python.initialization.modules": self.modules,
+            "python.initialization.import_time": self.import_time,
+        }
+
+        if not governor.spans:
+            tags["python.initialization.imports"] = [name for _, name, *_ in imports]
+            tags["python.initialization.import_times"] = [
+                self_time for self_time, *_ in imports
+            ]
+            dict.update(root.tags, tags)
+            return
+
+        initialization = TraceSpan._restore(
+            generate_id(),
+            root.trace_id,
+            root,
+            INITIALIZATION_SPAN,
+            start,
+            end,
+            tags=tags,
+        )
+
+        for self_time, name, import_start, import_end in imports:
+            TraceSpan._restore(
+                generate_id(),
+                root.trace_id,
+                initialization,
+                IMPORT_SPAN,
+                import_start,
+                import_end,
+                tags={
+                    "python.import.module": name,
+                    "python.import.self_time": self_time,
+                },
+            )
+
+
+import_profiler: Final[ImportProfiler] = ImportProfiler()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from array import array
+from json import dumps
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from pydantic import BaseModel
+from typing_extensions import Final
+from humps import camelize
+
+from ..base import Nanoseconds
+from .id import generate_id
+from .name import get_resource_name
+from .payload import SlsTagsBuf
+from .trace import TraceSpan
+
+
+__all__: Final[List[str]] = [
+    "DurationHistogram",
+    "MetricBuf",
+    "MetricPayloadBuf",
+    "SpanMetrics",
+    "span_metrics",
+]
+
+
+# log-linear buckets: `SUB_BUCKETS` per power of two, relative error < 1/8
+SUB_BITS: Final[int] = 3
+SUB_BUCKETS: Final[int] = 1 << SUB_BITS
+
+# durations of 2**MAX_BITS ns (about 3 days) and longer share the last bucket
+MAX_BITS: Final[int] = 48
+BUCKETS: Final[int] = (MAX_BITS - SUB_BITS + 1) * SUB_BUCKETS
+
+ZEROS: Final[array] = array("Q", bytes(8 * BUCKETS))
+
+QUANTILES: Final[Sequence[float]] = (0.0, 0.5, 0.9, 0.99, 1.0)
+
+
+class ValueAtQuantileBuf(BaseModel):
+    quantile: float
+    value: float
+
+
+class MetricBuf(BaseModel):
+    """Type-validated intermediate protobuf representation of a Metric"""
+
+    id: bytes
+    name: str
+    start_time_unix_nano: Nanoseconds
+    end_time_unix_nano: Nanoseconds
+    tags: str
+    count: int
+    sum: float
+    quantile_values: List[ValueAtQuantileBuf]
+
+    class Config:
+        alias_generator = camelize
+        allow_population_by_field_name = True
+
+
+class MetricPayloadBuf(BaseModel):
+    """Type-validated intermediate protobuf representation of a MetricPayload"""
+
+    sls_tags: SlsTagsBuf
+    metrics: List[MetricBuf]
+
+    class Config:
+        alias_generator = camelize
+        allow_population_by_field_name = True
+
+
+def get_bucket(value: Nanoseconds) -> int:
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+
+    shift = value.bit_length() - SUB_BITS - 1
+    index = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+    return min(index, BUCKETS - 1)
+
+
+def get_bucket_middle(index: int) -> float:
+    if index < SUB_BUCKETS:
+        return float(index)
+
+    shift = index // SUB_BUCKETS - 1
+    lower = (SUB_BUCKETS + index % SUB_BUCKETS) << shift
+
+    return lower + ((1 << shift) - 1) / 2
+
+
+class DurationHistogram:
+    """Span durations of one name, in a fixed amount of memory"""
+
+    __slots__ = ("counts", "count", "sum", "min", "max", "start", "end")
+
+    counts: array
+    count: int
+    sum: int
+    min: Nanoseconds
+    max: Nanoseconds
+    start: Nanoseconds
+    end: Nanoseconds
+
+    def __init__(self):
+        self.counts = array("Q", ZEROS)
+        self.reset()
+
+    def reset(self):
+        self.counts[:] = ZEROS
+        self.count = 0
+        self.sum = 0
+        self.min = self.max = 0
+        self.start = self.end = 0
+
+    def add(self, start: Nanoseconds, end: Nanoseconds):
+        duration = end - start
+        self.counts[get_bucket(duration)] += 1
+
+        if not self.count:
+            self.min = self.max = duration
+            self.start, self.end = start, end
+
+        else:
+            self.min = min(self.min, duration)
+            self.max = max(self.max, duration)
+            self.start = min(self.start, start)
+            self.end = max(self.end, end)
+
+        self.count += 1
+        self.sum += duration
+
+    def quantile(self, quantile: float) -> float:
+        """Middle of the bucket holding `quantile`, clamped to the exact extremes"""
+        if quantile <= 0.0:
+            return float(self.min)
+
+        if quantile >= 1.0:
+            return float(self.max)
+
+        rank = quantile * (self.count - 1)
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+
+            if seen > rank:
+                return min(max(get_bucket_middle(index), self.min), self.max)
+
+        return float(self.max)
+
+
+class SpanMetrics:
+    """Fold closed spans with a rule into duration metrics instead of exporting them
+
+    A rule is a span name. A folded span is exported neither itself nor with
+    its sub spans, only its duration is added to the histogram of its name.
+    Histograms have a fixed size, so memory doesn't grow with the number of
+    spans, and `flush()` turns them into `Metric`s.
+    """
+
+    histograms: Dict[str, DurationHistogram]
+    metric_names: Dict[str, str]
+
+    def __init__(self):
+        self.histograms = {}
+        self.metric_names = {}
+
+    def add_rule(self, span_name: str, metric_name: Optional[str] = None):
+        name = get_resource_name(span_name)
+        self.histograms[name] = DurationHistogram()
+        self.metric_names[name] = metric_name or f"{name}.duration"
+
+    def remove_rule(self, span_name: str):
+        self.histograms.pop(span_name, None)
+        self.metric_names.pop(span_name, None)
+
+    def export(self, root: TraceSpan) -> Iterator[TraceSpan]:
+        """Spans of the trace under `root` to export, folding the others"""
+        histograms = self.histograms
+
+        if not histograms:
+            yield from root.spans
+            return
+
+        stack: List[TraceSpan] = [root]
+
+        while stack:
+            span = stack.pop()
+            histogram = histograms.get(span.name)
+
+            if histogram is not None and span is not root and span.end_time:
+                histogram.add(span.start_time, span.end_time)
+                continue
+
+            yield span
+            stack.extend(reversed(span.sub_spans))
+
+    def flush(self) -> List[MetricBuf]:
+        """Metrics for spans folded since the last flush"""
+        metrics: List[MetricBuf] = []
+
+        for name, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+
+            metrics.append(
+                MetricBuf(
+                    id=generate_id(),
+                    name=self.metric_names[name],
+                    start_time_unix_nano=histogram.start,
+                    end_time_unix_nano=histogram.end,
+                    tags=dumps({"span.name": name}),
+                    count=histogram.count,
+                    sum=histogram.sum,
+                    quantile_values=[
+                        ValueAtQuantileBuf(
+                            quantile=quantile, value=histogram.quantile(quantile)
+                        )
+                        for quantile in QUANTILES
+                    ],
+                )
+            )
+            histogram.reset()
+
+        return metrics
+
+
+span_metrics: Final[SpanMetrics] = SpanMetrics()
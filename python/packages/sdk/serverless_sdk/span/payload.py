@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from json import dumps
+from typing import Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from typing_extensions import Final
+from humps import camelize
+
+from .redact import redactor
+from .tags import Tags
+from .trace import TraceSpan, TraceSpanBuf
+
+
+__all__: Final[List[str]] = [
+    "SlsTagsBuf",
+    "TracePayloadBuf",
+    "create_trace_payload",
+    "get_sls_tags",
+]
+
+
+# trace tags with a dedicated field in `SlsTags`, see `tags.proto`
+SLS_TAGS: Final[List[str]] = [
+    "environment",
+    "namespace",
+    "platform",
+    "region",
+    "service",
+]
+
+
+class SdkTagsBuf(BaseModel):
+    name: str
+    version: str
+
+
+class SlsTagsBuf(BaseModel):
+    """Type-validated intermediate protobuf representation of SlsTags"""
+
+    org_id: str
+    platform: Optional[str]
+    service: str
+    region: Optional[str]
+    sdk: SdkTagsBuf
+    environment: Optional[str]
+    namespace: Optional[str]
+
+    class Config:
+        alias_generator = camelize
+        allow_population_by_field_name = True
+
+
+class TracePayloadBuf(BaseModel):
+    """Type-validated intermediate protobuf representation of a TracePayload"""
+
+    sls_tags: SlsTagsBuf
+    spans: List[TraceSpanBuf]
+    events: List = []
+    custom_tags: Optional[str]
+
+    class Config:
+        alias_generator = camelize
+        allow_population_by_field_name = True
+
+
+def create_trace_payload(
+    spans: Iterable[TraceSpan],
+    trace_tags: Tags,
+    org_id: str,
+    name: str,
+    version: str,
+) -> TracePayloadBuf:
+    """Encode `spans`, emitting the shared `trace_tags` once for the payload
+
+    Well-known trace tags fill `SlsTags`, the rest are serialized into the
+    payload's `custom_tags`. Span tags only carry their own layers.
+    """
+    sls_tags, custom_tags = get_sls_tags(trace_tags, org_id, name, version)
+
+    return TracePayloadBuf(
+        sls_tags=sls_tags,
+        spans=[span.to_protobuf_object() for span in spans],
+        custom_tags=custom_tags,
+    )
+
+
+def get_sls_tags(
+    trace_tags: Tags,
+    org_id: str,
+    name: str,
+    version: str,
+) -> Tuple[SlsTagsBuf, Optional[str]]:
+    """Split scrubbed `trace_tags` into `SlsTags` and the JSON encoded custom tags"""
+    shared = redactor.scrub_tags(trace_tags.flatten())
+    custom = {key: value for key, value in shared.items() if key not in SLS_TAGS}
+
+    sls_tags = SlsTagsBuf(
+        org_id=org_id,
+        service=shared.get("service", ""),
+        sdk=SdkTagsBuf(name=name, version=version),
+        **{key: shared[key] for key in SLS_TAGS if key in shared and key != "service"},
+    )
+
+    return sls_tags, dumps(custom, default=str) if custom else None
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Type
+
+from typing_extensions import Final
+
+from ..exceptions import UseAfterRelease
+from .tags import Tags
+
+if TYPE_CHECKING:
+    from .trace import TraceSpan
+
+
+__all__: Final[List[str]] = [
+    "SpanPool",
+    "pool",
+]
+
+
+DEFAULT_SIZE: Final[int] = 1024
+
+
+class ReleasedSpan:
+    """Class of spans waiting in the pool, any use of them raises"""
+
+    def __getattr__(self, name: str) -> Any:
+        raise UseAfterRelease(f"Cannot get `{name}`: TraceSpan was released")
+
+    def __setattr__(self, name: str, value: Any):
+        raise UseAfterRelease(f"Cannot set `{name}`: TraceSpan was released")
+
+
+class SpanPool:
+    """Opt-in free list of the `TraceSpan` and `Tags` objects of exported traces
+
+    Released spans are emptied and switch class to `ReleasedSpan` until they
+    are acquired again, so references kept past `release()` fail loudly
+    instead of reading another trace's data. A reference kept until its span
+    has been reused cannot be told apart from the new owner's.
+    """
+
+    enabled: bool
+    size: int
+    reused: int
+    allocated: int
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        self.enabled = False
+        self.size = size
+        self.reused = 0
+        self.allocated = 0
+        self._free: List[Tuple[Any, Optional[Tags]]] = []
+
+    def acquire(self, cls: Type[TraceSpan]) -> TraceSpan:
+        """A reset span with its emptied `tags` kept, or a new one"""
+        # spans are created from several threads, `pop()` is atomic
+        try:
+            span, tags = self._free.pop()
+
+        except IndexError:
+            self.allocated += 1
+            return object.__new__(cls)
+
+        object.__setattr__(span, "__class__", cls)
+        self.reused += 1
+
+        if tags is not None:
+            span.tags = tags
+
+        return span
+
+    def release(self, spans: Iterable[TraceSpan]):
+        """Return the spans of a closed, exported trace to the pool"""
+        free = self._free
+
+        for span in list(spans):
+            if len(free) >= self.size:
+                break
+
+            tags: Optional[Tags] = span.__dict__.get("tags")
+            span.__dict__.clear()
+
+            if tags is not None:
+                tags.clear()
+                tags.inherited = None
+
+            object.__setattr__(span, "__class__", ReleasedSpan)
+            free.append((span, tags))
+
+    def clear(self):
+        self._free.clear()
+        self.reused = 0
+        self.allocated = 0
+
+
+pool: Final[SpanPool] = SpanPool()
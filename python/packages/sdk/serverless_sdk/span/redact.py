@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import re
+from re import Match, Pattern
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # type: ignore  # Python >= 3.11
+except ImportError:
+    import sre_parse  # type: ignore
+
+from typing_extensions import Final
+
+
+__all__: Final[List[str]] = [
+    "DEFAULT_PATTERNS",
+    "Redactor",
+    "redactor",
+]
+
+
+REPLACEMENT: Final[str] = "[REDACTED]"
+
+# a `<name>_keep` group is kept in front of the replacement
+DEFAULT_PATTERNS: Final[Dict[str, str]] = {
+    "secret": (
+        r"(?P<secret_keep>"
+        r"(?i:\b(?:password|passwd|secret|api[_-]?key|access[_-]?key|token))"
+        r"[\"']?\s*[:=]\s*[\"']?)"
+        r"[^\s\"'&,;}]+"
+    ),
+    "bearer": r"(?P<bearer_keep>(?i:bearer)\s+)[A-Za-z0-9\-._~+/]+=*",
+    "aws_key": r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b",
+    "jwt": r"\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+",
+    "card": r"\b(?:\d[ -]?){12,18}\d\b",
+}
+
+
+def is_luhn_valid(text: str) -> bool:
+    digits = [int(char) for char in text if char.isdigit()]
+    checksum = sum(digits[-1::-2])
+    checksum += sum(sum(divmod(digit * 2, 10)) for digit in digits[-2::-2])
+
+    return checksum % 10 == 0
+
+
+# matches that are only redacted when they pass a check
+VALIDATORS: Final[Dict[str, Callable[[str], bool]]] = {
+    "card": is_luhn_valid,
+}
+
+# where a run of word characters starts and ends
+WORD_START: Final[Pattern] = re.compile(r"\b\w")
+WORD_END: Final[Pattern] = re.compile(r"\w\b")
+
+# character classes wider than this aren't worth a prefilter
+MAX_RANGE: Final[int] = 256
+
+REPEATS: Final = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def get_first_chars(pattern: str) -> Optional[Set[str]]:
+    """Characters every match of `pattern` starts with, None if unbounded"""
+    parsed = sre_parse.parse(pattern)
+    chars, nullable = _get_first(parsed, bool(parsed.state.flags & re.IGNORECASE))
+
+    return None if nullable else chars
+
+
+def _get_first(items: Any, ignore_case: bool) -> Tuple[Optional[Set[str]], bool]:
+    """First characters of a parsed sequence, and whether it can match nothing"""
+    chars: Set[str] = set()
+
+    for op, av in items:
+        nullable = False
+
+        if op is sre_parse.AT:
+            continue
+
+        if op is sre_parse.LITERAL:
+            first: Optional[Set[str]] = {chr(av)}
+
+        elif op is sre_parse.IN:
+            first = _get_class(av)
+
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            case = (ignore_case or add_flags & re.I) and not del_flags & re.I
+            first, nullable = _get_first(sub, bool(case))
+
+        elif op is sre_parse.BRANCH:
+            first = set()
+
+            for branch in av[1]:
+                branch_first, branch_nullable = _get_first(branch, ignore_case)
+
+                if branch_first is None:
+                    return None, True
+
+                first |= branch_first
+                nullable = nullable or branch_nullable
+
+        elif op in REPEATS:
+            low, _, sub = av
+            first, nullable = _get_first(sub, ignore_case)
+            nullable = nullable or low == 0
+
+        else:
+            return None, True
+
+        if first is None:
+            return None, True
+
+        if ignore_case:
+            first = {
+                *first,
+                *(char.lower() for char in first),
+                *(char.upper() for char in first),
+            }
+
+        chars |= first
+
+        if not nullable:
+            return chars, False
+
+    return chars, True
+
+
+def _get_class(items: Any) -> Optional[Set[str]]:
+    chars: Set[str] = set()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.add(chr(av))
+
+        elif op is sre_parse.RANGE and av[1] - av[0] <= MAX_RANGE:
+            chars.update(map(chr, range(av[0], av[1] + 1)))
+
+        elif op is sre_parse.CATEGORY and av is sre_parse.CATEGORY_DIGIT:
+            chars.update("0123456789")
+
+        else:
+            return None
+
+    return chars
+
+
+def get_combined_pattern(patterns: Mapping[str, str]) -> str:
+    """One alternation of named `patterns`
+
+    When every pattern starts with one of a known set of characters, a
+    lookahead on that set lets the scan skip other positions without
+    trying each alternative.
+    """
+    alternation = "|".join(
+        f"(?P<{name}>{pattern})" for name, pattern in patterns.items()
+    )
+    first: Set[str] = set()
+
+    for pattern in patterns.values():
+        chars = get_first_chars(pattern)
+
+        if chars is None:
+            return alternation
+
+        first |= chars
+
+    prefilter = "".join(map(re.escape, sorted(first)))
+
+    return f"(?=[{prefilter}])(?:{alternation})"
+
+
+class Redactor:
+    """Scrub secrets from exported span bodies and string tags
+
+    All patterns are compiled into one alternation, so each body is scanned
+    once however many patterns are configured. Bodies longer than
+    `capture_budget` characters are cut to it first, the rest would not be
+    exported, so it is never scanned. Without patterns, values are exported
+    as given.
+    """
+
+    patterns: Dict[str, str]
+    capture_budget: Optional[int]
+
+    def __init__(
+        self,
+        patterns: Optional[Mapping[str, str]] = None,
+        capture_budget: Optional[int] = None,
+    ):
+        self.configure(patterns, capture_budget)
+
+    def configure(
+        self,
+        patterns: Optional[Mapping[str, str]] = None,
+        capture_budget: Optional[int] = None,
+    ):
+        self.patterns = dict(patterns or {})
+        self.capture_budget = capture_budget
+        self._keep: Dict[str, str] = {
+            name: f"{name}_keep"
+            for name, pattern in self.patterns.items()
+            if f"(?P<{name}_keep>" in pattern
+        }
+        self._validated: Dict[str, Pattern] = {
+            name: re.compile(pattern)
+            for name, pattern in self.patterns.items()
+            if name in VALIDATORS
+        }
+        self._compiled: Optional[Pattern] = (
+            re.compile(get_combined_pattern(self.patterns)) if self.patterns else None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._compiled is not None
+
+    def scrub(self, value: Optional[str]) -> Optional[str]:
+        compiled = self._compiled
+
+        if compiled is None or not value:
+            return value
+
+        budget = self.capture_budget
+
+        if budget is not None and len(value) > budget:
+            value = value[:budget]
+
+        return self._sub(compiled, value)
+
+    def scrub_tags(self, tags: Dict[str, Any]) -> Dict[str, Any]:
+        """Scrub string and string list tag values, names are kept"""
+        if self._compiled is None:
+            return tags
+
+        return {name: self._scrub_tag(value) for name, value in tags.items()}
+
+    def _scrub_tag(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.scrub(value)
+
+        if isinstance(value, list):
+            return [self._scrub_tag(item) for item in value]
+
+        return value
+
+    def _sub(self, compiled: Pattern, value: str) -> str:
+        parts: List[str] = []
+        position = 0
+        match = compiled.search(value)
+
+        while match is not None:
+            start, end = match.span()
+            name: str = match.lastgroup  # type: ignore
+            validate = VALIDATORS.get(name)
+
+            if validate is not None and not validate(match.group()):
+                shorter = self._revalidate(name, value, start, end)
+
+                # a greedy match can take in words in front of a secret too
+                if shorter is None:
+                    next_word = WORD_START.search(value, start + 1)
+                    match = next_word and compiled.search(value, next_word.start())
+                    continue
+
+                end, replacement = shorter, REPLACEMENT
+
+            else:
+                replacement = self._replace(match)
+
+            parts += value[position:start], replacement
+            position = end
+            match = compiled.search(value, max(end, start + 1))
+
+        if not parts:
+            return value
+
+        parts.append(value[position:])
+
+        return "".join(parts)
+
+    def _replace(self, match: Match) -> str:
+        keep = self._keep.get(match.lastgroup)  # type: ignore
+
+        return REPLACEMENT if keep is None else match.group(keep) + REPLACEMENT
+
+    def _revalidate(self, name: str, value: str, start: int, end: int) -> Optional[int]:
+        """End of the longest valid candidate within a match that failed validation
+
+        A greedy match can take in words after a secret, e.g. digits following
+        a card number, so candidates ending at earlier word edges are checked.
+        """
+        pattern = self._validated[name]
+        validate = VALIDATORS[name]
+        edges = WORD_END.finditer(value, start, end)
+        ends = [edge.end() for edge in edges if edge.end() < end]
+
+        for candidate_end in reversed(ends):
+            if pattern.fullmatch(value, start, candidate_end) and validate(
+                value[start:candidate_end]
+            ):
+                return candidate_end
+
+        return None
+
+
+redactor: Final[Redactor] = Redactor()
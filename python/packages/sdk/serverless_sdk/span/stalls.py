@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import gc
+from asyncio import AbstractEventLoop, TimerHandle, get_event_loop
+from contextvars import Context
+from typing import Callable, Dict, List, Optional
+
+from typing_extensions import Final
+
+from ..base import Nanoseconds
+from . import clock
+from .governor import governor
+from .id import generate_id
+from .trace import TraceSpan
+
+
+__all__: Final[List[str]] = [
+    "StallProbes",
+    "stall_probes",
+]
+
+
+GC_SPAN: Final[str] = "python.gc"
+LOOP_SPAN: Final[str] = "python.event_loop.lag"
+
+# seconds between two event loop lag measurements
+DEFAULT_INTERVAL: Final[float] = 0.05
+
+NS_PER_SECOND: Final[int] = 1_000_000_000
+
+
+class StallProbes:
+    """Record garbage collector pauses and event loop lag above `threshold`
+
+    The `gc` probe times every collection from a `gc.callbacks` hook and
+    records a pause on the span current in the thread that triggered it. The
+    event loop probe schedules a callback every `interval` seconds and
+    measures how late it runs; the blocking code has yielded by then, so lag
+    is recorded on the root span.
+
+    A stall is recorded as a child span, or as `<span name>.count`,
+    `.duration` and `.max` tags when `spans` is False or the governor drops
+    child spans. Below the threshold, a probe only reads the clock.
+
+    Disabled while `threshold` is None, in which case no probe is installed.
+    """
+
+    threshold: Optional[Nanoseconds]
+    spans: bool
+
+    def __init__(self, threshold: Optional[Nanoseconds] = None, spans: bool = True):
+        self._on_gc: Callable[[str, Dict[str, int]], None] = self._gc_callback
+        self._gc_start: Nanoseconds = 0
+        self._context = Context()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._handle: Optional[TimerHandle] = None
+        self._interval = DEFAULT_INTERVAL
+        self._expected = 0.0
+        self.reset(threshold, spans)
+
+    def reset(self, threshold: Optional[Nanoseconds] = None, spans: bool = True):
+        self.threshold = threshold
+        self.spans = spans
+
+        if threshold is None:
+            self.stop_loop()
+
+            if self._on_gc in gc.callbacks:
+                gc.callbacks.remove(self._on_gc)
+
+        elif self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold is not None
+
+    def monitor_loop(
+        self,
+        loop: Optional[AbstractEventLoop] = None,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        """Measure the lag of `loop`, the current event loop by default"""
+        self.stop_loop()
+
+        if self.threshold is None:
+            return
+
+        self._loop = loop or get_event_loop()
+        self._interval = interval
+        self._schedule()
+
+    def stop_loop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._loop = self._handle = None
+
+    def _gc_callback(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._gc_start = clock.now()
+            return
+
+        end = clock.now()
+        threshold = self.threshold
+
+        if threshold is None or end - self._gc_start < threshold:
+            return
+
+        self._record(
+            GC_SPAN,
+            self._gc_start,
+            end,
+            {
+                "python.gc.generation": info["generation"],
+                "python.gc.collected": info["collected"],
+            },
+        )
+
+    def _schedule(self):
+        loop: AbstractEventLoop = self._loop  # type: ignore
+        self._expected = loop.time() + self._interval
+
+        # an empty context, so lag isn't recorded on the span that started it
+        self._handle = loop.call_at(self._expected, self._tick, context=self._context)
+
+    def _tick(self):
+        loop: AbstractEventLoop = self._loop  # type: ignore
+        lag = int((loop.time() - self._expected) * NS_PER_SECOND)
+        threshold = self.threshold
+
+        if threshold is not None and lag >= threshold:
+            end = clock.now()
+            self._record(LOOP_SPAN, end - lag, end)
+
+        self._schedule()
+
+    def _record(
+        self,
+        name: str,
+        start: Nanoseconds,
+        end: Nanoseconds,
+        tags: Optional[Dict[str, int]] = None,
+    ):
+        span = TraceSpan.resolve_open_span()
+
+        # no trace is open, so there's nothing to attribute the stall to
+        if span is None:
+            return
+
+        if self.spans and governor.spans:
+            TraceSpan._restore(
+                generate_id(), span.trace_id, span, name, start, end, tags=tags
+            )
+            return
+
+        # tags can only be set once, so the counters bypass `Tags.__setitem__`
+        own = span.tags
+        duration = end - start
+        count: int = dict.get(own, f"{name}.count", 0)  # type: ignore
+        total: int = dict.get(own, f"{name}.duration", 0)  # type: ignore
+        longest: int = dict.get(own, f"{name}.max", 0)  # type: ignore
+        dict.update(
+            own,
+            {
+                f"{name}.count": count + 1,
+                f"{name}.duration": total + duration,
+                f"{name}.max": max(longest, duration),
+            },
+        )
+
+
+stall_probes: Final[StallProbes] = StallProbes()
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from math import inf, nan
 from re import Pattern
-from typing import Dict, Iterable, List, Mapping, Tuple
+from sys import intern
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 from itertools import chain
 
 from js_regex import compile
@@ -20,17 +21,72 @@ from ..exceptions import (
 RE: Final[str] = r"^[a-zA-Z0-9_.-]+$"
 RE_C: Final[Pattern] = compile(RE)
 
+# longer string values are rarely repeated, so aren't worth interning
+INTERN_LIMIT: Final[int] = 128
+
 
 class Tags(Dict[str, ValidTags]):
+    """Tags set on a span, layered over the tags it `inherited`
+
+    Lookups fall back to the inherited layers, while iteration, length and
+    equality only cover tags set on this layer, so `tags == {...}` compares
+    own tags only; use `flatten()` to compare the full view. Setting an
+    inherited tag shadows it here and leaves the shared layer untouched.
+    """
+
+    inherited: Optional[Tags]
+
+    def __init__(self, *args, inherited: Optional[Tags] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inherited = inherited
+
+    def __missing__(self, key: str) -> ValidTags:
+        if self.inherited is None:
+            raise KeyError(key)
+
+        return self.inherited[key]
+
+    def __contains__(self, key: Any) -> bool:
+        if super().__contains__(key):
+            return True
+
+        return self.inherited is not None and key in self.inherited
+
+    def get(self, key: str, default: Optional[ValidTags] = None) -> ValidTags:
+        try:
+            return self[key]
+
+        except KeyError:
+            return default
+
+    def flatten(self, until: Optional[Tags] = None) -> Dict[str, ValidTags]:
+        """Merge this layer with its inherited layers, stopping at `until`"""
+        layers: List[Tags] = []
+        layer: Optional[Tags] = self
+
+        while layer is not None and layer is not until:
+            layers.append(layer)
+            layer = layer.inherited
+
+        flat: Dict[str, ValidTags] = {}
+
+        for layer in reversed(layers):
+            flat.update(layer.items())
+
+        return flat
+
     def __setitem__(self, key: str, value: ValidTags):
-        name = ensure_tag_name(key, key)
+        name = intern(ensure_tag_name(key, key))
         value = ensure_tag_value(name, value)
 
-        if name not in self:
+        if isinstance(value, str) and len(value) <= INTERN_LIMIT:
+            value = intern(value)
+
+        if not super().__contains__(name):
             super().__setitem__(name, value)
             return
 
-        current: ValidTags = self[name]
+        current: ValidTags = super().__getitem__(name)
 
         if isinstance(current, list):
             if value != current:
@@ -41,7 +97,15 @@ class Tags(Dict[str, ValidTags]):
     def update(self, mapping: Mapping, **kwargs) -> None:
         items: Iterable[Tuple[str, ValidTags]]
 
-        if mapping and hasattr(mapping, "items"):
+        if isinstance(mapping, Tags):
+            # take the whole layered view, minus what this layer inherits anyway
+            items = [
+                (key, value)
+                for key, value in chain(mapping.flatten().items(), kwargs.items())
+                if not self._inherits(key, value)
+            ]
+
+        elif mapping and hasattr(mapping, "items"):
             items = mapping.items()
 
         elif mapping:
@@ -53,6 +117,12 @@ class Tags(Dict[str, ValidTags]):
         for key, value in items:
             self[key] = value
 
+    def _inherits(self, key: str, value: ValidTags) -> bool:
+        if self.inherited is None or key not in self.inherited:
+            return False
+
+        return self.inherited[key] == value
+
 
 def is_valid_name(name: str) -> bool:
     match = RE_C.match(name)
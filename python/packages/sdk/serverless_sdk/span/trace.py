@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from time import time_ns
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional
 from contextvars import ContextVar
 
 from backports.cached_property import cached_property  # available in Python >=3.8
@@ -14,10 +13,15 @@ from ..exceptions import (
     ClosureOnClosedSpan,
     FutureSpanStartTime,
     InvalidType,
+    PastSpanEndTime,
     UnreachableTrace,
 )
+from . import clock
+from .governor import governor
 from .id import generate_id
 from .name import get_resource_name
+from .pool import pool
+from .redact import redactor
 from .tags import Tags
 
 
@@ -34,6 +38,12 @@ TraceSpanContext = ContextVar[Optional["TraceSpan"]]
 ctx: Final[TraceSpanContext] = ContextVar("ctx", default=None)
 root_span = None  # type: Optional[TraceSpan]
 
+# tags shared by every span, exported once per trace payload
+trace_tags: Final[Tags] = Tags()
+
+# called when a trace begins, before its root span reads the clock
+begin_trace_callbacks: Final[List[Callable[[], None]]] = []
+
 
 class TraceSpanBuf(BaseModel):
     """Type-validated intermediate protobuf representation of a TraceSpan"""
@@ -61,9 +71,14 @@ class TraceSpan:
     name: str
     start_time: Nanoseconds
     end_time: Optional[Nanoseconds] = None
-    input: Optional[str] = None
-    output: Optional[str] = None
     tags: Tags
+    sub_spans: List[TraceSpan]
+
+    def __new__(cls, *args, **kwargs) -> TraceSpan:
+        if pool.enabled:
+            return pool.acquire(cls)
+
+        return super().__new__(cls)
 
     def __init__(
         self,
@@ -73,13 +88,29 @@ class TraceSpan:
         start_time: Optional[Nanoseconds] = None,
         tags: Optional[Tags] = None,
     ):
+        if root_span is NO_SPAN:
+            TraceSpan._begin_trace()
+
+        start = governor.start()
         self.name = get_resource_name(name)
         self.input = input
         self.output = output
+        self.sub_spans = []
 
         self._set_start_time(start_time)
-        self._set_tags(tags)
-        self._set_spans()
+        self._set_spans(tags)
+        governor.charge(start)
+
+    @staticmethod
+    def _begin_trace():
+        # a new trace re-anchors the clock before any of its times are read
+        clock.anchor()
+        governor.begin()
+
+        if begin_trace_callbacks:
+            # a callback may remove itself
+            for callback in tuple(begin_trace_callbacks):
+                callback()
 
     @staticmethod
     def resolve_current_span() -> Optional[TraceSpan]:
@@ -88,13 +119,30 @@ class TraceSpan:
 
         return span or root_span or NO_SPAN
 
+    @staticmethod
+    def resolve_open_span() -> Optional[TraceSpan]:
+        """The current span, or its closest open ancestor, if any"""
+        span = TraceSpan.resolve_current_span()
+
+        while span is not None and span.end_time is not None:
+            span = span.parent_span if span.parent_span is not span else None
+
+        return span
+
     @staticmethod
     def _get_span() -> Optional[TraceSpan]:
         return ctx.get(NO_SPAN)
 
-    def _set_spans(self):
+    def _set_spans(self, tags: Optional[Tags]):
+        parent: Optional[TraceSpan] = NO_SPAN
+
+        # a new trace's root has no parent, whatever is left in the context
+        if root_span is not NO_SPAN:
+            parent = TraceSpan.resolve_open_span() or root_span
+
+        self._set_tags(tags, parent)
         self._set_root_span()
-        self._set_parent_span()
+        self._set_parent_span(parent)
         self._set_ctx()
 
     def _set_root_span(self):
@@ -103,28 +151,39 @@ class TraceSpan:
         if root_span is NO_SPAN:
             root_span = self
             self.parent_span = NO_SPAN
+            governor.record(self.tags)
 
         elif root_span.end_time is not NO_SPAN:
             raise UnreachableTrace("Cannot initialize span: Trace is closed")
 
-    def _set_parent_span(self):
-        global root_span
-        self.parent_span = TraceSpan.resolve_current_span()
+    def _set_parent_span(self, parent: Optional[TraceSpan]):
+        if parent is NO_SPAN:
+            self.parent_span = self
+            return
+
+        self.parent_span = parent
 
-        while self.parent_span.end_time:
-            self.parent_span = self.parent_span.parent_span or root_span
+        if governor.spans:
+            parent.sub_spans.append(self)
 
     def _set_ctx(self):
         ctx.set(self)
 
-    def _set_tags(self, tags: Optional[Tags]):
-        self.tags = Tags()
+    def _set_tags(self, tags: Optional[Tags], parent: Optional[TraceSpan]):
+        inherited: Tags = trace_tags if parent is NO_SPAN else parent.tags
+        pooled: Optional[Tags] = self.__dict__.get("tags")
+
+        if pooled is None:
+            self.tags = Tags(inherited=inherited)
 
-        if tags is not None:
+        else:
+            pooled.inherited = inherited
+
+        if tags is not None and governor.tags:
             self.tags.update(tags)
 
     def _set_start_time(self, start_time: Optional[Nanoseconds]):
-        default_start = time_ns()
+        default_start = clock.now()
 
         if start_time is not None and not isinstance(start_time, Nanoseconds):
             raise InvalidType("`start_time` must be an integer.")
@@ -149,6 +208,78 @@ class TraceSpan:
 
         return parent.trace_id if parent else generate_id()
 
+    @property
+    def spans(self) -> Iterator[TraceSpan]:
+        yield self
+
+        for sub_span in self.sub_spans:
+            yield from sub_span.spans
+
+    @classmethod
+    def _restore(
+        cls,
+        id: TraceId,
+        trace_id: TraceId,
+        parent_span: Optional[TraceSpan],
+        name: str,
+        start_time: Nanoseconds,
+        end_time: Optional[Nanoseconds] = None,
+        input: Optional[str] = None,
+        output: Optional[str] = None,
+        tags: Optional[Tags] = None,
+        attach: bool = True,
+    ) -> TraceSpan:
+        """Rebuild a span from already validated fields, bypassing context."""
+        span = cls.__new__(cls)
+        span.id = id
+        span.trace_id = trace_id
+        span.parent_span = parent_span
+        span.name = name
+        span.start_time = start_time
+        span.end_time = end_time
+        span._input = input
+        span._output = output
+        inherited: Tags = trace_tags if parent_span is None else parent_span.tags
+        pooled: Optional[Tags] = span.__dict__.get("tags")
+
+        if isinstance(tags, Tags):
+            span.tags = tags
+
+        elif pooled is not None:
+            pooled.inherited = inherited
+            dict.update(pooled, tags or ())
+
+        else:
+            span.tags = Tags(tags or (), inherited=inherited)
+
+        span.sub_spans = []
+
+        if parent_span is not None and attach:
+            parent_span.sub_spans.append(span)
+
+        return span
+
+    @property
+    def _inherited_tags(self) -> Tags:
+        """Tags exported by the parent span or the trace payload instead"""
+        parent = self.parent_span
+
+        if parent is None or parent is self:
+            return trace_tags
+
+        return parent.tags
+
+    @property
+    def input(self) -> Optional[str]:
+        return self._input
+
+    @input.setter
+    def input(self, value: Optional[str]):
+        if value is not None and not isinstance(value, str):
+            raise InvalidType("`input` must be a string.")
+
+        self._input = value if governor.bodies else None
+
     @property
     def output(self) -> str:
         return self._output
@@ -158,16 +289,27 @@ class TraceSpan:
         if value is not None and not isinstance(value, str):
             raise InvalidType("`output` must be a string.")
 
-        self._output = value
+        self._output = value if governor.bodies else None
 
     def close(self, end_time: Optional[Nanoseconds] = None):
         global root_span
-        default: Nanoseconds = time_ns()
 
         if self.end_time is not None:
             raise ClosureOnClosedSpan("TraceSpan already closed.")
 
-        self.end_time = default if end_time is None else end_time
+        if end_time is None:
+            self.end_time = clock.now()
+            return
+
+        if not isinstance(end_time, Nanoseconds):
+            raise InvalidType("`end_time` must be an integer.")
+
+        if end_time < self.start_time:
+            raise PastSpanEndTime(
+                "Cannot close span: End time cannot be earlier than start time"
+            )
+
+        self.end_time = end_time
 
     def to_protobuf_object(self) -> TraceSpanBuf:
         return TraceSpanBuf(
@@ -177,7 +319,9 @@ class TraceSpan:
             name=self.name,
             start_time_unix_nano=self.start_time,
             end_time_unix_nano=self.end_time,
-            tags=self.tags,
-            input=self.input,
-            output=self.output,
+            tags=Tags(
+                redactor.scrub_tags(self.tags.flatten(until=self._inherited_tags))
+            ),
+            input=redactor.scrub(self.input),
+            output=redactor.scrub(self.output),
         )
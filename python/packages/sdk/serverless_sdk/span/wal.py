@@ -0,0 +1,355 @@
+"""Durable write-ahead queue of encoded trace payloads
+
+The queue is a directory of numbered segment files and a cursor::
+
+    00000000000000000001.seg   MAGIC, then records: length, crc32, payload ...
+    00000000000000000002.seg   ...
+    cursor                     segment number, offset of the next record
+
+Payloads are appended to the newest segment, a new segment is started once it
+grows past `segment_size`. Appends are fsync'ed in batches, at the latest once
+`sync_bytes` are pending or `sync_interval` seconds have passed. When the
+segments use more than `max_bytes`, the oldest ones are deleted, unsent.
+
+`drain()` hands queued payloads to a sink in order and moves the cursor past
+the ones it accepted, deleting segments once they are fully sent. Delivery is
+at least once: payloads sent after the cursor was last saved are sent again
+after a crash. A torn record at the end of a segment, left by a crash during
+an append, ends that segment.
+
+Segments are only read back when they're drained, and once when the queue is
+opened to count what is left to send.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from os import PathLike, fsync, replace
+from pathlib import Path
+from struct import Struct
+from threading import Event, Lock
+from time import monotonic
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from zlib import crc32
+
+from typing_extensions import Final, Self
+
+from ..exceptions import InvalidSegment
+
+
+__all__: Final[List[str]] = [
+    "WriteAheadQueue",
+]
+
+
+MAGIC: Final[bytes] = b"SLSWAL\x00\x01"
+SUFFIX: Final[str] = ".seg"
+CURSOR: Final[str] = "cursor"
+
+RECORD: Final[Struct] = Struct("<II")
+POSITION: Final[Struct] = Struct("<QQ")
+
+DEFAULT_SEGMENT_SIZE: Final[int] = 4 * 1024 * 1024
+DEFAULT_MAX_BYTES: Final[int] = 64 * 1024 * 1024
+DEFAULT_SYNC_BYTES: Final[int] = 1024 * 1024
+DEFAULT_SYNC_INTERVAL: Final[float] = 1.0
+
+# payloads read from disk at a time while draining
+DRAIN_BATCH: Final[int] = 256
+
+# replay backoff after the sink fails, in seconds
+MIN_BACKOFF: Final[float] = 0.1
+MAX_BACKOFF: Final[float] = 30.0
+
+Sink = Callable[[bytes], None]
+Position = Tuple[int, int]
+StrPath = Union[str, PathLike]
+
+
+class WriteAheadQueue:
+    """Persist encoded payloads on disk until a sink accepts them
+
+    Safe to use from several threads, e.g. producers calling `put()` while
+    `replay()` runs in the background.
+    """
+
+    path: Path
+    evicted: int
+
+    def __init__(
+        self,
+        path: StrPath,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sync_bytes: int = DEFAULT_SYNC_BYTES,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.max_bytes = max_bytes
+        self.sync_bytes = sync_bytes
+        self.sync_interval = sync_interval
+        self.evicted = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._sizes: Dict[int, int] = {}
+
+        # payloads not sent yet, per segment
+        self._unsent: Dict[int, int] = {}
+
+        for number in self._numbers():
+            size = self._segment(number).stat().st_size
+
+            # left behind by a queue that was closed without appending
+            if size <= len(MAGIC):
+                self._segment(number).unlink()
+
+            else:
+                self._sizes[number] = size
+
+        self._cursor: Position = self._load_cursor()
+
+        for number in self._sizes:
+            self._unsent[number] = 0
+
+        for _, (number, _) in self._iter_records(self._cursor):
+            self._unsent[number] += 1
+
+        # always append to a new segment, older ones may end with a torn record
+        self._number: int = max([*self._sizes, self._cursor[0]]) + 1
+        self._file: BinaryIO = self._create(self._number)
+        self._pending = 0
+        self._synced_at = monotonic()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        """Payloads waiting to be sent"""
+        with self._lock:
+            return sum(self._unsent.values())
+
+    @property
+    def size(self) -> int:
+        """Bytes used by all segments"""
+        return sum(self._sizes.values())
+
+    def put(self, data: bytes):
+        self.put_many((data,))
+
+    def put_many(self, payloads: Iterable[bytes]):
+        """Append encoded payloads with a single write"""
+        chunks: List[bytes] = []
+
+        for data in payloads:
+            chunks.append(RECORD.pack(len(data), crc32(data)))
+            chunks.append(data)
+
+        if not chunks:
+            return
+
+        block = b"".join(chunks)
+
+        with self._lock:
+            size = self._sizes[self._number]
+
+            if size > len(MAGIC) and size + len(block) > self.segment_size:
+                self._rotate()
+
+            self._file.write(block)
+            self._sizes[self._number] += len(block)
+            self._unsent[self._number] += len(chunks) // 2
+            self._pending += len(block)
+
+            if (
+                self._pending >= self.sync_bytes
+                or monotonic() - self._synced_at >= self.sync_interval
+            ):
+                self._sync()
+
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def flush(self):
+        """Write and fsync everything appended so far"""
+        with self._lock:
+            self._sync()
+
+    def drain(self, sink: Sink) -> int:
+        """Send queued payloads to `sink` in order and return how many it took
+
+        Payloads are read in batches under the lock and sent outside of it, so
+        a slow sink doesn't block `put()`. An exception raised by `sink` stops
+        the drain and propagates, the payload it failed on stays queued.
+        """
+        sent = 0
+
+        while True:
+            with self._lock:
+                self._file.flush()
+                records = list(islice(self._iter_records(self._cursor), DRAIN_BATCH))
+
+            if not records:
+                return sent
+
+            accepted: List[Position] = []
+
+            try:
+                for data, position in records:
+                    sink(data)
+                    sent += 1
+                    accepted.append(position)
+
+            finally:
+                if accepted:
+                    with self._lock:
+                        self._advance(accepted)
+
+    def replay(
+        self,
+        sink: Sink,
+        stop: Event,
+        interval: float = DEFAULT_SYNC_INTERVAL,
+    ):
+        """Drain the queue into `sink` until `stop` is set
+
+        Failures are retried with exponential backoff, so an unavailable sink
+        is polled less and less often until it recovers.
+        """
+        backoff = MIN_BACKOFF
+
+        while not stop.is_set():
+            try:
+                self.drain(sink)
+
+            except Exception:
+                stop.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+
+            backoff = MIN_BACKOFF
+            stop.wait(interval)
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+
+            self._sync()
+            self._file.close()
+
+    def _segment(self, number: int) -> Path:
+        return self.path / f"{number:020d}{SUFFIX}"
+
+    def _numbers(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.path.glob(f"*{SUFFIX}"))
+
+    def _create(self, number: int) -> BinaryIO:
+        file = self._segment(number).open("wb")
+        file.write(MAGIC)
+        self._sizes[number] = len(MAGIC)
+        self._unsent[number] = 0
+
+        return file
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        self._number += 1
+        self._file = self._create(self._number)
+
+    def _sync(self):
+        self._file.flush()
+        fsync(self._file.fileno())
+        self._pending = 0
+        self._synced_at = monotonic()
+
+    def _evict(self):
+        for number in sorted(self._sizes):
+            if self.size <= self.max_bytes or number == self._number:
+                break
+
+            self.evicted += self._unsent[number]
+            self._delete(number)
+
+        cursor, _ = self._cursor
+
+        if cursor not in self._sizes:
+            self._cursor = (min(self._sizes), len(MAGIC))
+            self._save_cursor()
+
+    def _advance(self, accepted: List[Position]):
+        # eviction may have moved the cursor past records being sent
+        accepted = [position for position in accepted if position > self._cursor]
+
+        if not accepted:
+            return
+
+        for number, _ in accepted:
+            self._unsent[number] -= 1
+
+        position = accepted[-1]
+        number, _ = position
+
+        for previous in [n for n in self._sizes if n < number]:
+            self._delete(previous)
+
+        self._cursor = position
+        self._save_cursor()
+
+    def _delete(self, number: int):
+        self._segment(number).unlink()
+        del self._sizes[number]
+        del self._unsent[number]
+
+    def _iter_records(self, start: Position) -> Iterable[Tuple[bytes, Position]]:
+        """Records after `start`, with the position following each of them"""
+        first, offset = start
+
+        for number in sorted(self._sizes):
+            if number < first:
+                continue
+
+            yield from self._iter_segment(number, offset if number == first else None)
+
+    def _iter_segment(
+        self, number: int, offset: Optional[int] = None
+    ) -> Iterable[Tuple[bytes, Position]]:
+        with self._segment(number).open("rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise InvalidSegment(f"{self._segment(number)} is not a segment")
+
+            if offset is not None:
+                file.seek(offset)
+
+            while True:
+                header = file.read(RECORD.size)
+
+                if len(header) < RECORD.size:
+                    return
+
+                length, checksum = RECORD.unpack(header)
+                data = file.read(length)
+
+                if len(data) < length or crc32(data) != checksum:
+                    return
+
+                yield data, (number, file.tell())
+
+    def _load_cursor(self) -> Position:
+        path = self.path / CURSOR
+
+        if path.exists():
+            number, offset = POSITION.unpack(path.read_bytes())
+
+            return number, offset
+
+        return min(self._sizes, default=0), len(MAGIC)
+
+    def _save_cursor(self):
+        temporary = self.path / f"{CURSOR}.tmp"
+        temporary.write_bytes(POSITION.pack(*self._cursor))
+        replace(temporary, self.path / CURSOR)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..exceptions import (
+    FutureSpanStartTime,
+    InvalidTraceSpanName,
+    InvalidTraceSpanTagName,
+    InvalidValue,
+    PastSpanEndTime,
+)
+from ..span import trace
+from ..span.clock import now
+from ..span.trace import TraceSpan
+
+
+AMOUNT: Final[int] = 10
+NAME: Final[str] = "batch.record"
+
+
+@pytest.fixture
+def sdk() -> ServerlessSdk:
+    from .. import serverlessSdk
+
+    return serverlessSdk
+
+
+@pytest.fixture
+def root() -> TraceSpan:
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    return TraceSpan("root")
+
+
+def get_times() -> List[int]:
+    current = now()
+
+    return [current - 1_000 * index for index in range(AMOUNT)]
+
+
+def test_create_trace_spans(sdk: ServerlessSdk, root: TraceSpan):
+    starts = get_times()
+    ends = [start + 10 for start in starts]
+    names = [NAME] * AMOUNT
+
+    spans = sdk.create_trace_spans(names, starts, ends, tags={"batch.size": AMOUNT})
+
+    assert len(spans) == AMOUNT
+    assert len({span.id for span in spans}) == AMOUNT
+    assert root.sub_spans == spans
+
+    for span, start, end in zip(spans, starts, ends):
+        assert span.name == NAME
+        assert span.parent_span is root
+        assert span.trace_id == root.trace_id
+        assert span.start_time == start
+        assert span.end_time == end
+        assert span.tags["batch.size"] == AMOUNT
+        assert span.to_protobuf_object().tags == {"batch.size": AMOUNT}
+
+    # shared tags are inherited, not copied
+    assert spans[0].tags is not spans[1].tags
+    assert spans[0].tags.inherited is spans[1].tags.inherited
+    assert trace.ctx.get() is root
+
+
+def test_create_trace_spans_per_span_tags(sdk: ServerlessSdk, root: TraceSpan):
+    starts = get_times()
+    tags = [{"index": index} for index in range(AMOUNT)]
+
+    spans = sdk.create_trace_spans([NAME] * AMOUNT, starts, starts, tags=tags)
+
+    assert [span.tags["index"] for span in spans] == list(range(AMOUNT))
+
+
+def test_create_trace_spans_validates(sdk: ServerlessSdk, root: TraceSpan):
+    starts = get_times()
+    names = [NAME] * AMOUNT
+
+    with pytest.raises(InvalidValue):
+        sdk.create_trace_spans(names, starts, starts[:-1])
+
+    with pytest.raises(InvalidTraceSpanName):
+        sdk.create_trace_spans(["Invalid name"] * AMOUNT, starts, starts)
+
+    with pytest.raises(PastSpanEndTime):
+        sdk.create_trace_spans(names, starts, [start - 1 for start in starts])
+
+    with pytest.raises(FutureSpanStartTime):
+        future = [now() + 10**12] * AMOUNT
+        sdk.create_trace_spans(names, future, future)
+
+    with pytest.raises(InvalidTraceSpanTagName):
+        sdk.create_trace_spans(names, starts, starts, tags={"invalid name": 1})
+
+    assert not root.sub_spans
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from time import time_ns
+
+from typing_extensions import Final
+
+from ..span import clock
+
+
+TOLERANCE: Final[int] = 10**9
+
+
+def test_now_is_epoch_time():
+    assert abs(clock.now() - time_ns()) < TOLERANCE
+
+
+def test_now_is_monotonic():
+    times = [clock.now() for _ in range(1_000)]
+
+    assert times == sorted(times)
+
+
+def test_anchor_follows_wall_clock():
+    clock.offset -= TOLERANCE * 60
+    assert abs(clock.now() - time_ns()) > TOLERANCE
+
+    clock.anchor()
+    assert abs(clock.now() - time_ns()) < TOLERANCE
+
+
+def test_new_trace_is_anchored_before_its_start_time():
+    from ..span import trace
+    from ..span.trace import TraceSpan
+
+    trace.root_span = None
+    trace.ctx.set(None)
+    clock.offset -= TOLERANCE * 60
+
+    try:
+        root = TraceSpan("root")
+        child = TraceSpan("child")
+        child.close()
+        root.close()
+
+    finally:
+        trace.root_span = None
+        trace.ctx.set(None)
+
+    assert abs(root.start_time - time_ns()) < TOLERANCE
+    assert 0 <= root.end_time - root.start_time < TOLERANCE
+    assert root.start_time <= child.start_time <= child.end_time <= root.end_time
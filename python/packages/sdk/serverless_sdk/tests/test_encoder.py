@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import datetime
+from io import StringIO
+from typing import Iterator
+
+import pytest
+
+from . import ServerlessSdk
+from ..span import trace
+from ..span.encoder import write_payload, write_span
+from ..span.payload import create_trace_payload
+from ..span.trace import TraceSpan
+
+
+@pytest.fixture
+def sdk() -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    trace.root_span = None
+    trace.ctx.set(None)
+    serverlessSdk.tags.clear()
+    serverlessSdk.tags.update({"service": "svc", "region": "eu", "custom.tag": 1})
+
+    yield serverlessSdk
+
+    serverlessSdk.tags.clear()
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def test_write_span_matches_pydantic(sdk: ServerlessSdk):
+    root = TraceSpan("root", input='"quoted" ünïcode\n')
+    child = TraceSpan(
+        "child",
+        tags={
+            "list": [1, 2],
+            "date": datetime(2020, 1, 1),
+            "float": 1.5,
+            "bool": True,
+            "str": "x",
+        },
+    )
+    child.output = "done"
+    child.close()
+    root.close()
+
+    for span in (root, child):
+        buffer = StringIO()
+        write_span(buffer, span)
+
+        assert buffer.getvalue() == span.to_protobuf_object().json(by_alias=True)
+
+
+def test_write_trace_payload_matches_pydantic(sdk: ServerlessSdk):
+    root = TraceSpan("root")
+
+    for index in range(3):
+        TraceSpan("child", tags={"index": index}).close()
+
+    root.close()
+
+    fields = sdk.tags, sdk.org_id or "", sdk.name, sdk.version
+    expected = create_trace_payload(root.spans, *fields).json(by_alias=True)
+    buffer = StringIO()
+    write_payload(buffer, root.spans, *fields)
+    assert buffer.getvalue() == expected
+
+    buffer = StringIO()
+    sdk._write_trace_payload(buffer)
+    assert buffer.getvalue() == expected
+
+
+def test_write_empty_trace_payload(sdk: ServerlessSdk):
+    sdk.tags.clear()
+    buffer = StringIO()
+    sdk._write_trace_payload(buffer)
+
+    assert buffer.getvalue() == sdk._create_trace_payload().json(by_alias=True)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from time import sleep
+from typing import List
+
+import pytest
+from typing_extensions import Final
+
+from ..span import trace
+from ..span.executor import (
+    TracedProcessPoolExecutor,
+    TracedThreadPoolExecutor,
+    run_in_executor,
+)
+from ..span.trace import TraceSpan
+
+
+ROOT_NAME: Final[str] = "root"
+WORKER_NAME: Final[str] = "worker"
+CHILD_NAME: Final[str] = "worker.child"
+
+
+@pytest.fixture
+def root() -> TraceSpan:
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    return TraceSpan(ROOT_NAME)
+
+
+def create_span(name: str = WORKER_NAME) -> TraceSpan:
+    return TraceSpan(name)
+
+
+def create_nested_spans(value: int) -> int:
+    outer = TraceSpan(WORKER_NAME)
+    inner = TraceSpan(CHILD_NAME)
+    inner.close()
+    outer.close()
+
+    return value * 2
+
+
+def test_thread_pool_propagates_parent(root: TraceSpan):
+    with TracedThreadPoolExecutor() as executor:
+        spans: List[TraceSpan] = list(executor.map(lambda _: create_span(), range(4)))
+
+    for span in spans:
+        assert span.parent_span is root
+        assert span.trace_id == root.trace_id
+
+    assert trace.ctx.get() is root
+
+
+def test_process_pool_merges_spans(root: TraceSpan):
+    with TracedProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(create_nested_spans, range(3)))
+
+    assert results == [0, 2, 4]
+    assert len(root.sub_spans) == 3
+
+    for outer in root.sub_spans:
+        assert outer.name == WORKER_NAME
+        assert outer.trace_id == root.trace_id
+        assert outer.end_time is not None
+
+        (inner,) = outer.sub_spans
+        assert inner.name == CHILD_NAME
+        assert inner.parent_span is outer
+        assert inner.trace_id == root.trace_id
+
+
+def sleep_with_span(seconds: float) -> float:
+    span = TraceSpan(WORKER_NAME)
+    sleep(seconds)
+    span.close()
+
+    return seconds
+
+
+def test_process_pool_cancel_skips_task(root: TraceSpan):
+    with TracedProcessPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(sleep_with_span, 0.5)
+        queued = [executor.submit(sleep_with_span, 0.0) for _ in range(5)]
+
+        # the pool hands a few tasks to its call queue early, those can't be
+        # cancelled anymore, while the rest are still pending
+        sleep(0.1)
+        cancelled = [future.cancel() for future in queued]
+        assert cancelled[-1]
+        assert first.result() == 0.5
+
+        for future, was_cancelled in zip(queued, cancelled):
+            assert future.cancelled() == was_cancelled
+
+            if not was_cancelled:
+                assert future.result() == 0.0
+
+    assert len(root.sub_spans) == 1 + cancelled.count(False)
+
+
+def test_process_pool_propagates_errors(root: TraceSpan):
+    with TracedProcessPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(create_nested_spans, None)
+
+        with pytest.raises(TypeError):
+            future.result()
+
+
+def test_asyncio_gather_isolates_siblings(root: TraceSpan):
+    async def work() -> TraceSpan:
+        create_span()
+        await asyncio.sleep(0)
+        child = create_span(CHILD_NAME)
+
+        return child
+
+    async def main() -> List[TraceSpan]:
+        return await asyncio.gather(work(), work())
+
+    children = asyncio.run(main())
+
+    for child in children:
+        assert child.parent_span.parent_span is root
+
+    assert children[0].parent_span is not children[1].parent_span
+
+
+def test_run_in_executor_propagates_parent(root: TraceSpan):
+    async def main() -> TraceSpan:
+        return await run_in_executor(None, create_span)
+
+    span = asyncio.run(main())
+
+    assert span.parent_span is root
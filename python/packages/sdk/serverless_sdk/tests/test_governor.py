@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from statistics import median
+from time import thread_time_ns
+from typing import Iterator, List, Optional
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..span import trace
+from ..span.governor import Fidelity, Governor
+from ..span.payload import TracePayloadBuf
+from ..span.trace import TraceSpan
+
+
+SPANS: Final[int] = 50
+BODY: Final[str] = "x" * 2048
+INVOCATIONS: Final[int] = 40
+
+
+class FakeTimer:
+    """Every reading advances the clock by `step` nanoseconds"""
+
+    def __init__(self, step: int):
+        self.step = step
+        self.time = 0
+
+    def __call__(self) -> int:
+        self.time += self.step
+
+        return self.time
+
+
+@pytest.fixture
+def sdk() -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    yield serverlessSdk
+
+    serverlessSdk.governor.reset()
+    serverlessSdk.governor.timer = thread_time_ns
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def invoke(sdk: ServerlessSdk) -> Optional[TracePayloadBuf]:
+    """Synthetic invocation: a root span with `SPANS` child spans"""
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    root = TraceSpan("invocation", input=BODY)
+
+    for index in range(SPANS):
+        child = TraceSpan("work", tags={"index": index})
+        child.input = child.output = BODY
+        child.close()
+
+    root.close()
+
+    return sdk._create_trace_payload()
+
+
+def test_disabled_by_default(sdk: ServerlessSdk):
+    payload = invoke(sdk)
+
+    assert payload is not None
+    assert len(payload.spans) == SPANS + 1
+    assert "sdk.governor.level" not in payload.spans[0].tags
+
+
+def test_steps_down_fidelity(sdk: ServerlessSdk):
+    governor: Governor = sdk.governor
+    governor.reset(budget=1)
+    governor.timer = FakeTimer(step=1)
+
+    payload = invoke(sdk)
+    assert payload.spans[0].tags["sdk.governor.level"] == "full"
+    assert payload.spans[1].input == BODY
+
+    payload = invoke(sdk)
+    root = payload.spans[0]
+    assert root.tags["sdk.governor.level"] == "no_bodies"
+    assert root.tags["sdk.governor.step"] == "down"
+    assert root.tags["sdk.governor.cpu_time"] > 1
+    assert root.input is None
+    assert [span.input for span in payload.spans] == [None] * (SPANS + 1)
+    assert [span.output for span in payload.spans] == [None] * (SPANS + 1)
+    assert payload.spans[1].tags == {"index": 0}
+
+    payload = invoke(sdk)
+    assert governor.level is Fidelity.NO_TAGS
+    assert payload.spans[1].tags == {}
+
+    payload = invoke(sdk)
+    assert governor.level is Fidelity.NO_CHILD_SPANS
+    assert len(payload.spans) == 1
+    assert payload.spans[0].tags["sdk.governor.step"] == "down"
+
+    payloads: List[Optional[TracePayloadBuf]] = [
+        invoke(sdk) for _ in range(governor.sample_rate * 2)
+    ]
+    assert governor.level is Fidelity.SAMPLED
+    assert sum(payload is not None for payload in payloads) == 2
+
+
+def test_steps_up_after_recovery(sdk: ServerlessSdk):
+    governor: Governor = sdk.governor
+    governor.reset(budget=1)
+    governor.timer = FakeTimer(step=1)
+
+    invoke(sdk)
+    invoke(sdk)
+    assert governor.level is Fidelity.NO_BODIES
+
+    governor.budget = 10**12
+
+    for _ in range(governor.recovery):
+        assert governor.level is Fidelity.NO_BODIES
+        payload = invoke(sdk)
+
+    assert governor.level is Fidelity.FULL
+    assert payload.spans[0].tags["sdk.governor.step"] == "up"
+
+
+def test_overhead_stays_within_budget(sdk: ServerlessSdk):
+    governor: Governor = sdk.governor
+
+    # measure a full fidelity invocation, then allow half of it
+    governor.reset(budget=10**12)
+    full = median(_spent(sdk) for _ in range(5))
+    budget = full // 2
+    governor.reset(budget)
+
+    spent = [_spent(sdk) for _ in range(INVOCATIONS)]
+
+    assert spent[0] > budget
+    assert governor.level > Fidelity.FULL
+    assert median(spent[INVOCATIONS // 4 :]) <= budget
+
+
+def _spent(sdk: ServerlessSdk) -> int:
+    invoke(sdk)
+
+    return sdk.governor.spent
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from ..span.id import generate_id
+from typing import List
+
+from ..span.id import generate_id, generate_ids
 
 
 def test_generate_id():
@@ -10,3 +12,12 @@ def test_generate_id():
 
     assert len(new_id) == 32
     assert len(new_bytes) == 16
+
+
+def test_generate_ids():
+    ids: List[str] = generate_ids(100)
+
+    assert len(ids) == 100
+    assert len(set(ids)) == 100
+    assert all(len(bytes.fromhex(new_id)) == 16 for new_id in ids)
+    assert generate_ids(0) == []
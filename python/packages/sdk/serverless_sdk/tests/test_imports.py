@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sys
+import time
+from importlib.machinery import ModuleSpec, SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..span import trace
+from ..span.imports import IMPORT_SPAN, INITIALIZATION_SPAN, TimedLoader
+from ..span.trace import TraceSpan
+
+
+MODULES: Final[int] = 5
+SLOW: Final[str] = "import time\ntime.sleep(0.02)\n"
+
+
+@pytest.fixture
+def sdk(tmp_path: Path) -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    package = tmp_path / "slow_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import slow\n")
+    (package / "slow.py").write_text(SLOW)
+
+    for index in range(MODULES):
+        (package / f"fast_{index}.py").write_text("VALUE = 1\n")
+
+    sys.path.insert(0, str(tmp_path))
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    yield serverlessSdk
+
+    serverlessSdk.import_profiler.reset()
+    serverlessSdk.governor.reset()
+    sys.path.remove(str(tmp_path))
+
+    for name in [name for name in sys.modules if name.startswith("slow_package")]:
+        del sys.modules[name]
+
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def initialize(sdk: ServerlessSdk, top: int = 3):
+    sdk.import_profiler.install(top)
+
+    import slow_package  # noqa: F401
+
+    for index in range(MODULES):
+        __import__(f"slow_package.fast_{index}")
+
+
+def test_imports_are_recorded_on_first_trace(sdk: ServerlessSdk):
+    initialize(sdk)
+
+    root = TraceSpan("root")
+    root.close()
+    payload = sdk._create_trace_payload()
+
+    assert not sdk.import_profiler.installed
+    assert [span.name for span in payload.spans][:2] == ["root", INITIALIZATION_SPAN]
+
+    initialization = root.sub_spans[0]
+    assert initialization.end_time <= root.start_time
+    assert initialization.tags["python.initialization.modules"] == MODULES + 2
+
+    imports = initialization.sub_spans
+    assert len(imports) == 3
+    assert {span.name for span in imports} == {IMPORT_SPAN}
+    assert imports[0].tags["python.import.module"] == "slow_package.slow"
+    assert imports[0].tags["python.import.self_time"] >= 20_000_000
+
+
+def test_nested_imports_are_not_self_time(sdk: ServerlessSdk):
+    initialize(sdk, top=MODULES + 2)
+
+    root = TraceSpan("root")
+    root.close()
+    sdk.import_profiler.attach(root)
+
+    times = {
+        span.tags["python.import.module"]: span.tags["python.import.self_time"]
+        for span in root.sub_spans[0].sub_spans
+    }
+    assert times["slow_package.slow"] >= 20_000_000
+    assert times["slow_package"] < 20_000_000
+
+
+def test_initialization_is_recorded_once(sdk: ServerlessSdk):
+    initialize(sdk)
+
+    for _ in range(2):
+        trace.root_span = None
+        trace.ctx.set(None)
+        root = TraceSpan("root")
+        root.close()
+        sdk._create_trace_payload()
+
+    assert not root.sub_spans
+
+
+def test_imports_during_a_trace_are_dropped(sdk: ServerlessSdk):
+    initialize(sdk, top=MODULES + 2)
+    del sys.modules["slow_package.fast_0"]
+
+    root = TraceSpan("root")
+    __import__("slow_package.fast_0")
+    root.close()
+    sdk._create_trace_payload()
+
+    initialization = root.sub_spans[0]
+    modules = [span.tags["python.import.module"] for span in initialization.sub_spans]
+    assert initialization.tags["python.initialization.modules"] == MODULES + 2
+    assert modules.count("slow_package.fast_0") == 1
+    assert all(span.end_time <= root.start_time for span in initialization.sub_spans)
+
+
+def test_initialization_outlasts_a_sampled_out_trace(sdk: ServerlessSdk):
+    initialize(sdk)
+
+    root = TraceSpan("root")
+    root.close()
+    sdk.governor.sampled = False
+    sdk._create_trace_payload()
+
+    assert not sdk.import_profiler.installed
+    assert not root.sub_spans
+
+    sdk.governor.sampled = True
+    root = TraceSpan("root")
+    root.close()
+    sdk._create_trace_payload()
+
+    assert root.sub_spans[0].name == INITIALIZATION_SPAN
+
+
+def test_create_module_is_timed(sdk: ServerlessSdk, tmp_path: Path):
+    class SlowLoader(SourceFileLoader):
+        def create_module(self, spec: ModuleSpec) -> None:
+            time.sleep(0.02)
+
+    name = "slow_package.fast_0"
+    sdk.import_profiler.install(1)
+    loader = TimedLoader(
+        SlowLoader(name, str(tmp_path / "slow_package" / "fast_0.py")),
+        sdk.import_profiler,
+    )
+    module = module_from_spec(spec_from_loader(name, loader))  # type: ignore
+    loader.exec_module(module)
+
+    assert module.VALUE == 1
+    self_time, module_name, *_ = sdk.import_profiler.imports[0]
+    assert module_name == name
+    assert self_time >= 20_000_000
+
+
+def test_modules_keep_their_loader(sdk: ServerlessSdk):
+    initialize(sdk)
+
+    import slow_package.slow
+
+    assert isinstance(slow_package.slow.__loader__, SourceFileLoader)
+    assert isinstance(slow_package.slow.__spec__.loader, SourceFileLoader)
+
+
+def test_imports_as_tags_without_child_spans(sdk: ServerlessSdk):
+    initialize(sdk, top=2)
+    sdk.governor.spans = False
+
+    root = TraceSpan("root")
+    root.close()
+    sdk.import_profiler.attach(root)
+
+    assert not root.sub_spans
+    assert root.tags["python.initialization.imports"][0] == "slow_package.slow"
+    assert len(root.tags["python.initialization.import_times"]) == 2
+
+
+def test_profiler_is_not_installed_by_default(sdk: ServerlessSdk):
+    root = TraceSpan("root")
+    root.close()
+    sdk._create_trace_payload()
+
+    assert not sdk.import_profiler.installed
+    assert not root.sub_spans
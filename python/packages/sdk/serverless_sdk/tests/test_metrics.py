@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..span import trace
+from ..span.metrics import BUCKETS, DurationHistogram
+from ..span.trace import TraceSpan
+
+
+LOOKUPS: Final[int] = 100
+
+
+@pytest.fixture
+def sdk() -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    yield serverlessSdk
+
+    serverlessSdk.span_metrics.remove_rule("cache.get")
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def run_trace() -> TraceSpan:
+    root = TraceSpan("root")
+    start = root.start_time
+
+    for index in range(LOOKUPS):
+        lookup = TraceSpan("cache.get", start_time=start)
+        TraceSpan("cache.connect", start_time=start).close(start + 1)
+        lookup.close(start + (index + 1) * 1_000)
+
+    TraceSpan("db.query").close()
+    root.close()
+
+    return root
+
+
+def test_histogram_quantiles():
+    histogram = DurationHistogram()
+
+    for duration in range(1, 10_001):
+        histogram.add(0, duration * 1_000)
+
+    assert histogram.count == 10_000
+    assert histogram.quantile(0.0) == 1_000
+    assert histogram.quantile(1.0) == 10_000_000
+    assert histogram.quantile(0.5) == pytest.approx(5_000_000, rel=1 / 8)
+    assert histogram.quantile(0.99) == pytest.approx(9_900_000, rel=1 / 8)
+
+    # memory doesn't grow with the number of spans
+    assert len(histogram.counts) == BUCKETS
+    histogram.add(0, 2**62)
+    assert len(histogram.counts) == BUCKETS
+
+
+def test_rules_fold_spans_into_metrics(sdk: ServerlessSdk):
+    sdk.span_metrics.add_rule("cache.get")
+    run_trace()
+
+    payload = sdk._create_trace_payload()
+    assert [span.name for span in payload.spans] == ["root", "db.query"]
+
+    metric_payload = sdk._create_metric_payload()
+    (metric,) = metric_payload.metrics
+
+    assert metric.name == "cache.get.duration"
+    assert metric.count == LOOKUPS
+    assert metric.sum == sum((index + 1) * 1_000 for index in range(LOOKUPS))
+    assert metric.tags == '{"span.name": "cache.get"}'
+    assert metric.quantile_values[0].value == 1_000
+    assert metric.quantile_values[-1].value == LOOKUPS * 1_000
+    assert '"quantileValues"' in metric_payload.json(by_alias=True)
+
+    # folded durations are only flushed once
+    assert sdk._create_metric_payload() is None
+
+
+def test_without_rules_every_span_is_exported(sdk: ServerlessSdk):
+    run_trace()
+
+    payload = sdk._create_trace_payload()
+
+    assert len(payload.spans) == 2 * LOOKUPS + 2
+    assert sdk._create_metric_payload() is None
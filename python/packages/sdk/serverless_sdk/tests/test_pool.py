@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..exceptions import UseAfterRelease
+from ..span import trace
+from ..span.trace import TraceSpan
+
+
+SPANS: Final[int] = 5
+
+
+@pytest.fixture
+def sdk() -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    trace.root_span = None
+    trace.ctx.set(None)
+    serverlessSdk._initialize(span_pool=True)
+
+    yield serverlessSdk
+
+    serverlessSdk._initialize()
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def run_trace(index: int) -> List[TraceSpan]:
+    root = TraceSpan("root", input=f"input-{index}")
+
+    for child in range(SPANS):
+        TraceSpan("child", tags={"index": index, "child": child}).close()
+
+    root.close()
+
+    return list(root.spans)
+
+
+def test_spans_are_reused_after_export(sdk: ServerlessSdk):
+    first = run_trace(0)
+    first_ids = {id(span) for span in first}
+    payload = sdk._create_trace_payload()
+
+    assert trace.root_span is None
+    assert sdk.span_pool.allocated == SPANS + 1
+
+    second = run_trace(1)
+
+    assert {id(span) for span in second} == first_ids
+    assert sdk.span_pool.reused == SPANS + 1
+
+    root, *children = second
+    assert root.input == "input-1"
+    assert root.parent_span is root
+    assert root.sub_spans == children
+    assert [span.tags["child"] for span in children] == list(range(SPANS))
+    assert len({span.id for span in second}) == SPANS + 1
+    assert root.trace_id != payload.spans[0].trace_id.decode()
+
+    # the exported payload doesn't share anything with the reused spans
+    assert payload.spans[0].input == "input-0"
+    assert [span.tags["index"] for span in payload.spans[1:]] == [0] * SPANS
+
+
+def test_released_spans_raise(sdk: ServerlessSdk):
+    root, child, *_ = run_trace(0)
+    sdk._create_trace_payload()
+
+    with pytest.raises(UseAfterRelease):
+        root.name
+
+    with pytest.raises(UseAfterRelease):
+        child.close()
+
+    with pytest.raises(UseAfterRelease):
+        child.output = "late"
+
+
+def test_payloads_match_without_pool(sdk: ServerlessSdk):
+    def export(index: int):
+        run_trace(index)
+        payload = sdk._create_trace_payload()
+
+        if not sdk.span_pool.enabled:
+            trace.root_span = None
+            trace.ctx.set(None)
+
+        # ids and times differ between runs
+        return [(span.name, span.input, span.tags) for span in payload.spans]
+
+    pooled = [export(index) for index in range(3)]
+    sdk._initialize(span_pool=False)
+    unpooled = [export(index) for index in range(3)]
+
+    assert pooled == unpooled
+
+
+def test_bulk_spans_are_reused(sdk: ServerlessSdk):
+    root = TraceSpan("root")
+    starts = [root.start_time] * SPANS
+    sdk.create_trace_spans(["bulk"] * SPANS, starts, starts, tags=[{}] * SPANS)
+    root.close()
+    sdk._create_trace_payload()
+
+    root = TraceSpan("root")
+    spans = sdk.create_trace_spans(
+        ["bulk"] * SPANS, starts, starts, tags={"shared": True}
+    )
+
+    assert sdk.span_pool.reused == SPANS + 1
+    assert all(span.tags["shared"] for span in spans)
+    assert root.sub_spans == spans
+
+
+def test_disabled_by_default(sdk: ServerlessSdk):
+    sdk._initialize()
+    root, *_ = run_trace(0)
+    sdk._create_trace_payload()
+
+    # the trace still ends on export, but its spans aren't released
+    assert trace.root_span is None
+    assert root.name == "root"
+
+    # the next span starts a new trace, with or without the pool
+    assert TraceSpan("next").parent_span is trace.root_span
+
+
+def test_acquire_from_threads(sdk: ServerlessSdk):
+    pool = sdk.span_pool
+    threads, acquires = 8, 500
+
+    for index in range(threads):
+        run_trace(index)
+        sdk._create_trace_payload()
+
+    # every thread races for the few free spans left
+    def acquire():
+        for _ in range(acquires):
+            pool.acquire(TraceSpan)
+
+    with ThreadPoolExecutor(threads) as executor:
+        for future in [executor.submit(acquire) for _ in range(threads)]:
+            future.result()
+
+    assert not pool._free
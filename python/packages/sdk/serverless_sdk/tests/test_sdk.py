@@ -88,3 +88,61 @@ def test_create_trace_span_returns_trace_span(sdk: ServerlessSdk):
     span = sdk.create_trace_span("name", "input", "output")
 
     assert isinstance(span, TraceSpan)
+
+
+@pytest.fixture
+def trace_state(sdk: ServerlessSdk):
+    from ..span import trace
+
+    trace.root_span = None
+    trace.ctx.set(None)
+    sdk.tags.clear()
+
+    yield
+
+    sdk.tags.clear()
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def test_create_trace_payload_emits_shared_tags_once(sdk: ServerlessSdk, trace_state):
+    from json import loads
+    from ..span.trace import TraceSpan
+
+    sdk.tags.update({"service": "my-service", "region": "us-east-1", "team": "a"})
+
+    root = TraceSpan("root", tags={"local": 1})
+    child = TraceSpan("child")
+    child.close()
+    root.close()
+
+    payload = sdk._create_trace_payload()
+
+    assert payload.sls_tags.service == "my-service"
+    assert payload.sls_tags.region == "us-east-1"
+    assert payload.sls_tags.sdk.name == sdk.name
+    assert loads(payload.custom_tags) == {"team": "a"}
+
+    # the child sees its parent's and the trace's tags, but doesn't export them
+    assert child.tags["local"] == 1
+    assert child.tags["service"] == "my-service"
+
+    assert len(payload.spans) == 2
+    assert payload.spans[0].tags == {"local": 1}
+    assert payload.spans[1].tags == {}
+
+
+def test_trace_span_copies_layered_tags(sdk: ServerlessSdk, trace_state):
+    from ..span.trace import TraceSpan
+
+    sdk.tags["service"] = "my-service"
+
+    root = TraceSpan("root", tags={"local": 1})
+    child = TraceSpan("child", tags={"own": 2})
+    child.close()
+    sibling = TraceSpan("sibling", tags=child.tags)
+
+    # inherited keys are kept, but the shared layers aren't copied locally
+    assert sibling.tags.flatten() == {"service": "my-service", "local": 1, "own": 2}
+    assert sibling.tags == {"own": 2}
+    assert root.tags == {"local": 1}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+from time import sleep
+from typing import Iterator, List
+
+import pytest
+from typing_extensions import Final
+
+from . import ServerlessSdk
+from ..span import trace
+from ..span.stalls import GC_SPAN, LOOP_SPAN
+from ..span.trace import TraceSpan
+
+
+MS: Final[int] = 1_000_000
+
+
+@pytest.fixture
+def sdk() -> Iterator[ServerlessSdk]:
+    from .. import serverlessSdk
+
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    yield serverlessSdk
+
+    serverlessSdk.stall_probes.reset()
+    serverlessSdk.governor.reset()
+    trace.root_span = None
+    trace.ctx.set(None)
+
+
+def get_spans(span: TraceSpan, name: str) -> List[TraceSpan]:
+    return [sub_span for sub_span in span.sub_spans if sub_span.name == name]
+
+
+def test_gc_pause_is_recorded_on_current_span(sdk: ServerlessSdk):
+    sdk.stall_probes.reset(0)
+    root = TraceSpan("root")
+    child = TraceSpan("child")
+
+    gc.collect()
+
+    pauses = get_spans(child, GC_SPAN)
+    assert pauses
+    assert pauses[-1].tags["python.gc.generation"] == 2
+    assert pauses[-1].end_time >= pauses[-1].start_time
+    assert not get_spans(root, GC_SPAN)
+
+    child.close()
+    root.close()
+    payload = sdk._create_trace_payload()
+    assert GC_SPAN in {span.name for span in payload.spans}
+
+
+def test_gc_pause_below_threshold_is_ignored(sdk: ServerlessSdk):
+    sdk.stall_probes.reset(60_000 * MS)
+    root = TraceSpan("root")
+
+    gc.collect()
+
+    assert not root.sub_spans
+    assert not root.tags
+
+
+def test_gc_pause_as_tags(sdk: ServerlessSdk):
+    sdk.stall_probes.reset(0, spans=False)
+    root = TraceSpan("root")
+
+    gc.collect()
+    gc.collect()
+
+    assert not root.sub_spans
+    assert root.tags[f"{GC_SPAN}.count"] >= 2
+    assert root.tags[f"{GC_SPAN}.duration"] >= root.tags[f"{GC_SPAN}.max"] >= 0
+
+
+def test_gc_pause_without_trace(sdk: ServerlessSdk):
+    sdk.stall_probes.reset(0)
+
+    gc.collect()
+
+    assert trace.root_span is None
+
+
+def test_reset_uninstalls_probe(sdk: ServerlessSdk):
+    probes = sdk.stall_probes
+
+    probes.reset(MS)
+    probes.reset(MS)
+    assert gc.callbacks.count(probes._on_gc) == 1
+
+    probes.reset()
+    assert probes._on_gc not in gc.callbacks
+    assert not probes.enabled
+
+
+def test_event_loop_lag(sdk: ServerlessSdk):
+    sdk.stall_probes.reset(20 * MS)
+
+    async def handler():
+        child = TraceSpan("child")
+        sdk.stall_probes.monitor_loop(interval=0.005)
+        await asyncio.sleep(0.01)
+
+        sleep(0.1)  # blocks the loop
+        await asyncio.sleep(0.02)
+
+        sdk.stall_probes.stop_loop()
+        child.close()
+
+    root = TraceSpan("root")
+    asyncio.run(handler())
+    root.close()
+
+    lags = get_spans(root, LOOP_SPAN)
+    assert len(lags) == 1
+    assert lags[0].end_time - lags[0].start_time >= 20 * MS
+    assert not get_spans(root.sub_spans[0], LOOP_SPAN)
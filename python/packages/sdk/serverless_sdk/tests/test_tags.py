@@ -117,3 +117,62 @@ def test_tags_duplicate(tags: Tags):
         for value in VALID_VALUES:
             with pytest.raises(DuplicateTraceSpanName):
                 tags[name] = value
+
+
+def test_tags_inherited():
+    shared = Tags()
+    shared["service"] = "example"
+
+    tags = Tags(inherited=shared)
+    tags["local"] = "value"
+
+    assert tags["service"] == "example"
+    assert tags.get("service") == "example"
+    assert "service" in tags
+    assert tags == {"local": "value"}
+    assert tags.flatten() == {"service": "example", "local": "value"}
+    assert tags.flatten(until=shared) == {"local": "value"}
+
+    # setting an inherited tag shadows it without touching the shared layer
+    tags["service"] = "override"
+
+    assert tags["service"] == "override"
+    assert shared["service"] == "example"
+
+    with pytest.raises(KeyError):
+        tags["missing"]
+
+    assert tags.get("missing") is None
+
+
+def test_tags_interned():
+    first, second = Tags(), Tags()
+    first["key"] = "".join(["va", "lue"])
+    second["key"] = "".join(["val", "ue"])
+
+    assert first["key"] is second["key"]
+
+
+def test_span_tags_inherit_from_open_parent():
+    from ..span import trace
+    from ..span.trace import TraceSpan, trace_tags
+
+    trace.root_span = None
+    trace.ctx.set(None)
+
+    root = TraceSpan("root", tags={"root.tag": "root"})
+    child = TraceSpan("child", tags={"child.tag": "child"})
+    child.close()
+
+    # the closed child is skipped, for the parent and the inherited tags alike
+    sibling = TraceSpan("sibling")
+
+    assert root.tags.inherited is trace_tags
+    assert sibling.parent_span is root
+    assert sibling.tags.inherited is root.tags
+    assert sibling.tags["root.tag"] == "root"
+    assert "child.tag" not in sibling.tags
+    assert TraceSpan.resolve_open_span() is sibling
+
+    trace.root_span = None
+    trace.ctx.set(None)
@@ -150,3 +150,27 @@ def test_can_set_output(trace_span: TraceSpan):
 
     with pytest.raises(InvalidType):
         trace_span.output = 1
+
+
+def test_close_validates_end_time(trace_span: TraceSpan):
+    from ..exceptions import InvalidType, PastSpanEndTime
+
+    with pytest.raises(PastSpanEndTime):
+        trace_span.close(TEST_START_TIME - 1)
+
+    with pytest.raises(InvalidType):
+        trace_span.close(float(TEST_START_TIME))
+
+    assert trace_span.end_time is None
+
+    trace_span.close(TEST_START_TIME)
+    assert trace_span.end_time == TEST_START_TIME
+
+
+def test_close_duration_is_not_negative():
+    from ..span.trace import TraceSpan
+
+    span = TraceSpan(TEST_NAME)
+    span.close()
+
+    assert span.end_time >= span.start_time
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event, Thread
+from typing import List
+
+import pytest
+from typing_extensions import Final
+
+from ..exceptions import InvalidSegment
+from ..span.wal import WriteAheadQueue
+
+
+PAYLOADS: Final[int] = 100
+
+
+class FlakySink:
+    """Stand-in telemetry sink that fails on purpose while it is `down`"""
+
+    def __init__(self, down: bool = True, failures: int = 0):
+        self.down = down
+        self.failures = failures
+        self.received: List[bytes] = []
+
+    def __call__(self, data: bytes):
+        if self.down:
+            raise ConnectionError("sink is down")
+
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink failed")
+
+        self.received.append(data)
+
+
+def get_payloads(amount: int = PAYLOADS) -> List[bytes]:
+    return [
+        f'{{"id": {index}, "input": "{"x" * 100}"}}'.encode() for index in range(amount)
+    ]
+
+
+@pytest.fixture
+def payloads() -> List[bytes]:
+    return get_payloads()
+
+
+def test_payloads_wait_for_sink(tmp_path: Path, payloads: List[bytes]):
+    sink = FlakySink()
+
+    with WriteAheadQueue(tmp_path) as queue:
+        queue.put_many(payloads[:50])
+
+        for data in payloads[50:]:
+            queue.put(data)
+
+        with pytest.raises(ConnectionError):
+            queue.drain(sink)
+
+        assert len(queue) == PAYLOADS
+
+        sink.down = False
+        assert queue.drain(sink) == PAYLOADS
+        assert len(queue) == 0
+
+    assert sink.received == payloads
+
+
+def test_partial_failure_keeps_order(tmp_path: Path, payloads: List[bytes]):
+    sink = FlakySink(down=False)
+
+    with WriteAheadQueue(tmp_path, segment_size=512) as queue:
+        queue.put_many(payloads)
+        assert queue.drain(lambda data: sink(data)) == PAYLOADS
+
+        queue.put_many(payloads)
+        received = len(sink.received)
+        sink.failures = 1
+
+        with pytest.raises(ConnectionError):
+            queue.drain(sink)
+
+        assert len(sink.received) == received
+        assert queue.drain(sink) == PAYLOADS
+
+    assert sink.received == payloads * 2
+
+
+def test_queue_survives_restart(tmp_path: Path, payloads: List[bytes]):
+    sink = FlakySink(down=False)
+
+    with WriteAheadQueue(tmp_path, segment_size=512) as queue:
+        queue.put_many(payloads)
+        sent = 0
+
+        def take_half(data: bytes):
+            nonlocal sent
+
+            if sent == PAYLOADS // 2:
+                raise ConnectionError("sink went away")
+
+            sent += 1
+            sink(data)
+
+        with pytest.raises(ConnectionError):
+            queue.drain(take_half)
+
+    # a torn append left by a crash is ignored
+    newest = sorted(tmp_path.glob("*.seg"))[-1]
+
+    with newest.open("ab") as file:
+        file.write(b"\xff\x00\x00\x00partial")
+
+    with WriteAheadQueue(tmp_path) as queue:
+        assert len(queue) == PAYLOADS // 2
+        queue.drain(sink)
+
+    assert sink.received == payloads
+    assert len(list(tmp_path.glob("*.seg"))) <= 2
+
+
+def test_oldest_segments_are_evicted(tmp_path: Path, payloads: List[bytes]):
+    sink = FlakySink(down=False)
+
+    with WriteAheadQueue(tmp_path, segment_size=1024, max_bytes=4096) as queue:
+        for data in payloads:
+            queue.put(data)
+
+        assert queue.size <= 4096 + 1024
+        assert queue.evicted > 0
+        assert len(queue) == PAYLOADS - queue.evicted
+
+        queue.drain(sink)
+
+    # whatever was kept is the newest payloads, in order
+    assert sink.received == payloads[-len(sink.received) :]
+
+
+def test_replay_drains_when_sink_recovers(tmp_path: Path, payloads: List[bytes]):
+    sink = FlakySink(down=False, failures=3)
+    stop = Event()
+
+    with WriteAheadQueue(tmp_path) as queue:
+        queue.put_many(payloads)
+        replay = Thread(target=queue.replay, args=(sink, stop, 0.01))
+        replay.start()
+
+        try:
+            for _ in range(200):
+                if len(sink.received) == PAYLOADS:
+                    break
+
+                stop.wait(0.05)
+
+        finally:
+            stop.set()
+            replay.join()
+
+    assert sink.received == payloads
+
+
+def test_rejects_other_files(tmp_path: Path):
+    (tmp_path / f"{1:020d}.seg").write_bytes(b"not a segment")
+
+    # queued payloads are counted on open
+    with pytest.raises(InvalidSegment):
+        WriteAheadQueue(tmp_path)